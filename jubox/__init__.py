@@ -1,5 +1,7 @@
-from .notebook import JupyterNotebook
+from .notebook import JupyterNotebook, NotebookCollection
 from .cell import JupyterCell, CodeCell, MarkdownCell, RawCell
+from .kernel import KernelPool, KernelSession, CellCache, BudgetExceededError, OutputLimits
+from .io import BlobStore, Interner, NotebookCache
 from . import builtin
 from . import utils
 
@@ -11,6 +11,8 @@ class JupyterObject:
     Base class for Jubox classes
     """
 
+    __slots__ = ()
+
     nb_version = 4
     kernel_name = "python3"
 
@@ -23,7 +25,8 @@ class JupyterObject:
         # https://stackoverflow.com/a/15774013/13696660
         cls = self.__class__
         result = cls.__new__(cls)
-        result.__dict__.update(self.__dict__)
+        for k, v in self._get_state().items():
+            object.__setattr__(result, k, v)
         return result
 
     def __deepcopy__(self, memo):
@@ -31,10 +34,24 @@ class JupyterObject:
         cls = self.__class__
         result = cls.__new__(cls)
         memo[id(self)] = result
-        for k, v in self.__dict__.items():
-            setattr(result, k, copy.deepcopy(v, memo))
+        for k, v in self._get_state().items():
+            object.__setattr__(result, k, copy.deepcopy(v, memo))
         return result
 
+    def _get_state(self):
+        "Get the instance attributes (including slots) to copy"
+        state = dict(getattr(self, "__dict__", {}))
+        for cls in type(self).__mro__:
+            for name in cls.__dict__.get("__slots__", ()):
+                try:
+                    state[name] = object.__getattribute__(self, name)
+                except AttributeError:
+                    pass
+        # Cached accessors are bound to the original
+        state.pop("_accessors", None)
+        state.pop("__weakref__", None)
+        return state
+
     @staticmethod
     def get_css():
         "Get CSS used in Jupyter Notebooks"
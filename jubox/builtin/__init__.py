@@ -1 +1,2 @@
-from .notebook import run_notebook, set_parameters
\ No newline at end of file
+from .notebook import run_notebook, run_notebook_async, run_notebooks, set_parameters
+from .sweep import sweep_notebook, parameter_grid
@@ -1,15 +1,26 @@
 from jubox import JupyterNotebook, CodeCell
 
 from nbconvert.preprocessors import CellExecutionError
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
 import sys
+import functools
+import contextlib
 import traceback
 
+EXECUTORS = {
+    "process": ProcessPoolExecutor,
+    "thread": ThreadPoolExecutor,
+}
+
 def _get_cell_exc_info(tb):
     "Get the actual exception raised in the notebook (instead of the CellExecutionError)"
     tbs = [tb_next for tb_next in traceback.walk_tb(tb)]
     last_tb = tbs[-1]
     f_locals = last_tb[0].f_locals
-    outputs = f_locals["outputs"]
+    cell = f_locals["cell"]
+    # The outputs are collected to the cell during the execution
+    outputs = cell["outputs"]
     for output in outputs:
         if output["output_type"] == "error":
             ename = output["ename"]
@@ -22,11 +33,10 @@ def _get_cell_exc_info(tb):
         traceback_ = None
 
     cellno = f_locals["cell_index"]
-    cell = f_locals["cell"]
     return dict(
         ename=ename,
         evalue=evalue,
-        traceback='\n'.join(traceback_),
+        traceback='\n'.join(traceback_) if traceback_ is not None else None,
         cellno=cellno, # Number of cell
         cell=CodeCell(cell), # Failed cell
     )
@@ -42,6 +52,11 @@ def run_notebook(notebook,
                 clear_outputs=True,
                 parameter_tag="parameters",
                 ignore_cells=None,
+                kernel_pool=None,
+                on_cell_start=None,
+                on_output=None,
+                on_cell_end=None,
+                output_limits=None,
                 kwds_run=None,
                 **kwargs):
     """Convenient function to execute a notebook
@@ -71,6 +86,30 @@ def run_notebook(notebook,
                 status {str} : Outcome of the execution (either "fail" or "success")
                 **kwargs
 
+        on_cell_start {function} : Function to call before a code cell is executed. Optional
+            Arguments Passed:
+                notebook {JupyterNotebook} : The notebook being executed
+                cell {JupyterCell} : The cell to execute
+                cell_index {int} : Index of the cell
+                **kwargs
+
+        on_output {function} : Function to call when the kernel emits an output (stream, 
+                            display data, execute result or error). Raising an exception 
+                            aborts the execution. Optional
+            Arguments Passed:
+                notebook {JupyterNotebook} : The notebook being executed
+                output {nbformat.notebooknode.NotebookNode} : The emitted output
+                cell {JupyterCell} : The cell being executed
+                cell_index {int} : Index of the cell
+                **kwargs
+
+        on_cell_end {function} : Function to call after a code cell is executed (or failed). Optional
+            Arguments Passed:
+                notebook {JupyterNotebook} : The notebook being executed
+                cell {JupyterCell} : The executed cell
+                cell_index {int} : Index of the cell
+                **kwargs
+
         parameters {dict} : Parameter dict for the notebook. Replaced to first cell 
                             containing tag specified in parameter_tag. Optional
 
@@ -82,6 +121,9 @@ def run_notebook(notebook,
         parameter_tag {str} : Cell tag for the parameters
 
         ignore_cells {Dict[str, Any]} : Dict for identifying cells to ignore for execution. See jubox.utils.cells_match
+        kernel_pool {KernelPool} : Pool of warm kernels to check out the kernel from. Optional
+        output_limits {OutputLimits, dict} : Limits for the outputs collected per cell and per 
+                            notebook. See jubox.kernel.OutputLimits. Optional
         kwds_run {Dict} : Keyword arguments 
 
         kwargs {dict} : Additional keyword arguments passed to on_failure, on_success & 
@@ -90,6 +132,69 @@ def run_notebook(notebook,
     --------
         JupyterNotebook
     """
+    notebook = _prepare_notebook(
+        notebook, 
+        parameters=parameters, parameters_with_imports=parameters_with_imports, 
+        clear_outputs=clear_outputs, parameter_tag=parameter_tag
+    )
+
+    kwds_run = {} if kwds_run is None else kwds_run
+    callbacks = _get_execution_callbacks(
+        notebook,
+        on_cell_start=on_cell_start, on_output=on_output, on_cell_end=on_cell_end,
+        **kwargs
+    )
+
+    with _handle_outcome(notebook, on_failure=on_failure, on_success=on_success, on_finally=on_finally, silence=silence, **kwargs):
+        notebook(inplace=True, ignore=ignore_cells, kernel_pool=kernel_pool, output_limits=output_limits, **callbacks, **kwds_run)
+    return notebook
+
+async def run_notebook_async(notebook,
+                on_failure=None,
+                on_success=None,
+                on_finally=None,
+                parameters=None,
+                parameters_with_imports=False,
+                silence=False,
+                clear_outputs=True,
+                parameter_tag="parameters",
+                ignore_cells=None,
+                kernel_pool=None,
+                on_cell_start=None,
+                on_output=None,
+                on_cell_end=None,
+                output_limits=None,
+                kwds_run=None,
+                **kwargs):
+    """Asynchronous version of run_notebook. See 
+    run_notebook for the arguments.
+
+    Examples:
+    ---------
+        notebooks = await asyncio.gather(
+            run_notebook_async("first.ipynb"),
+            run_notebook_async("second.ipynb", parameters={"category": "b"}),
+        )
+    """
+    notebook = _prepare_notebook(
+        notebook, 
+        parameters=parameters, parameters_with_imports=parameters_with_imports, 
+        clear_outputs=clear_outputs, parameter_tag=parameter_tag
+    )
+
+    kwds_run = {} if kwds_run is None else kwds_run
+    callbacks = _get_execution_callbacks(
+        notebook,
+        on_cell_start=on_cell_start, on_output=on_output, on_cell_end=on_cell_end,
+        **kwargs
+    )
+
+    with _handle_outcome(notebook, on_failure=on_failure, on_success=on_success, on_finally=on_finally, silence=silence, **kwargs):
+        await notebook.execute_async(inplace=True, ignore=ignore_cells, kernel_pool=kernel_pool, output_limits=output_limits, **callbacks, **kwds_run)
+    return notebook
+
+def _prepare_notebook(notebook, parameters=None, parameters_with_imports=False, clear_outputs=True, parameter_tag="parameters"):
+    "Create the notebook to run and set its parameters"
     notebook = JupyterNotebook(notebook)
 
     if parameters is not None:
@@ -97,26 +202,28 @@ def run_notebook(notebook,
 
     if clear_outputs:
         notebook.clear_outputs(inplace=True)
+    return notebook
 
-    kwds_run = {} if kwds_run is None else kwds_run
+def _get_execution_callbacks(notebook, **kwargs):
+    "Get the callbacks called during the execution with the notebook & extra arguments bound"
+    callbacks = {
+        name: kwargs.pop(name)
+        for name in ("on_cell_start", "on_output", "on_cell_end")
+    }
+    return {
+        name: functools.partial(callback, notebook=notebook, **kwargs) if callback is not None else None
+        for name, callback in callbacks.items()
+    }
 
+@contextlib.contextmanager
+def _handle_outcome(notebook, on_failure=None, on_success=None, on_finally=None, silence=False, **kwargs):
+    "Call the callbacks of the outcome of the execution run in the context"
     status = None
     try:
-        notebook(inplace=True, ignore=ignore_cells, **kwds_run)
+        yield
     except CellExecutionError:
         status = "fail"
-
-        exc_class, exc, tb = sys.exc_info()
-        tbs = [tb_next for tb_next in traceback.walk_tb(tb)]
-        cell_exc_info = _get_cell_exc_info(tb)
-
-        if on_failure is not None:
-            on_failure(
-                notebook=notebook,
-                exc_info=(exc_class, exc, tb),
-                **cell_exc_info,
-                **kwargs
-            )
+        _call_on_failure(on_failure, notebook, **kwargs)
         if not silence:
             raise
     else:
@@ -134,7 +241,68 @@ def run_notebook(notebook,
                 **kwargs
             )
 
-    return notebook
+def _call_on_failure(on_failure, notebook, **kwargs):
+    "Call on_failure with the info of the exception being handled"
+    exc_class, exc, tb = sys.exc_info()
+    cell_exc_info = _get_cell_exc_info(tb)
+
+    if on_failure is not None:
+        on_failure(
+            notebook=notebook,
+            exc_info=(exc_class, exc, tb),
+            **cell_exc_info,
+            **kwargs
+        )
+
+def run_notebooks(notebooks,
+                  parameters=None,
+                  max_workers=None,
+                  executor="process",
+                  **kwargs):
+    """Execute multiple notebooks concurrently
+
+    Each notebook is run with run_notebook in a separate
+    worker thus the callbacks (on_failure, on_success &
+    on_finally) are called per notebook in the worker.
+    Note that in process pool the callbacks and their
+    arguments must be picklable and their side effects
+    stay in the worker process.
+
+    Arguments:
+        notebooks {List[str, Path like, JupyterNotebook]} : Jupyter Notebooks to run
+
+        parameters {dict, List[dict]} : Parameter dict for all of the notebooks or
+                            list of parameter dicts (one for each notebook). Optional
+
+        max_workers {int} : Maximum number of notebooks running at the same time.
+                            Defaults to number of CPUs (bounded by number of notebooks)
+
+        executor {str} : Type of the worker pool ("process" or "thread"). Use "thread"
+                            to share a kernel_pool between the runs.
+
+        kwargs {dict} : Keyword arguments passed to run_notebook
+    Returns:
+    --------
+        List[JupyterNotebook] : Executed notebooks in the same order as the input.
+            Raises the exception of the first failed notebook (in input order) 
+            unless silence=True.
+    """
+    notebooks = list(notebooks)
+    if parameters is None or isinstance(parameters, dict):
+        parameters = [parameters] * len(notebooks)
+    elif len(parameters) != len(notebooks):
+        raise ValueError(f"Got {len(parameters)} parameter sets for {len(notebooks)} notebooks")
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(min(max_workers, len(notebooks)), 1)
+
+    with EXECUTORS[executor](max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(run_notebook, notebook, parameters=params, **kwargs)
+            for notebook, params in zip(notebooks, parameters)
+        ]
+        return [future.result() for future in futures]
 
 def set_parameters(notebook, params=None, *, parameter_tag="parameters", include_imports=False):
     if params is None:
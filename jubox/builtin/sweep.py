@@ -0,0 +1,170 @@
+from jubox import JupyterNotebook, KernelSession
+from jubox import utils
+from .notebook import set_parameters
+
+from nbconvert.preprocessors import CellExecutionError
+from concurrent.futures import ThreadPoolExecutor
+import os
+import copy
+import queue
+import logging
+import itertools
+
+logger = logging.getLogger(__name__)
+
+# Python specific code to restore the variables of
+# the setup cells (bindings, not the objects thus the
+# objects mutated in place are not restored) and to
+# remove the variables created after the setup cells
+SNAPSHOT_CODE = "_jubox_setup = dict(globals())"
+CLEANUP_CODE = (
+    "for _jubox_name in set(globals()) - set(_jubox_setup) - {'_jubox_setup'}:\n"
+    "    del globals()[_jubox_name]\n"
+    "globals().pop('_jubox_name', None)\n"
+    "globals().update(_jubox_setup)"
+)
+
+def sweep_notebook(notebook,
+                   parameters,
+                   max_workers=1,
+                   parameter_tag="parameters",
+                   parameters_with_imports=False,
+                   isolate=True,
+                   silence=False,
+                   timeout=None,
+                   kernel_pool=None):
+    """Execute a notebook over multiple parameter sets
+    reusing the setup cells
+
+    The cells before the parameter cell are considered
+    as parameter independent setup (ie. imports and data
+    loading) and they are executed only once per worker
+    kernel. After that, the parameter cell and the cells
+    after it are executed for each parameter set.
+
+    Arguments:
+        notebook {[str, Path like, JupyterNotebook]} : Jupyter Notebook to run
+
+        parameters {List[dict], Dict[str, list]} : List of parameter dicts or
+                            a grid (dict of lists) of parameters. Each dict
+                            replaces the cell having tag parameter_tag.
+
+        max_workers {int} : Number of kernels running the parameter sets
+        parameter_tag {str} : Cell tag for the parameters
+        parameters_with_imports {bool} : Whether to add import statements to parameters
+                            (default: False)
+
+        isolate {bool} : Whether to delete the variables created and restore the 
+                            variables of the setup cells rebound by the previous parameter 
+                            set before running the next (Python kernels only). Objects 
+                            mutated in place (ie. list.append) are not restored.
+
+        silence {bool} : Whether to silence the exceptions. If False, exception of the
+                            first failed parameter set is raised after all sets are run.
+        timeout {int} : Timeout of a cell execution (seconds)
+        kernel_pool {KernelPool} : Pool of warm kernels to check out the kernels from. Optional
+
+    Returns:
+    --------
+        List[JupyterNotebook] : Executed notebooks in the same order as the parameters
+
+    Examples:
+    ---------
+        notebooks = sweep_notebook(
+            "report.ipynb",
+            parameters={"category": ["a", "b"], "number": [1, 2, 3]},
+            max_workers=2
+        )
+    """
+    notebook = JupyterNotebook(notebook)
+    if isinstance(parameters, dict):
+        parameters = parameter_grid(**parameters)
+    parameters = list(parameters)
+
+    param_index = _get_cell_index(notebook, tags=[parameter_tag])
+
+    # Cells are executed with clean outputs
+    template = notebook.clear_outputs(inplace=False)
+    if hasattr(notebook, "file"):
+        template.file = notebook.file
+
+    jobs = queue.Queue()
+    for i, params in enumerate(parameters):
+        jobs.put((i, params))
+
+    results = [None] * len(parameters)
+    errors = [None] * len(parameters)
+
+    kwds_worker = dict(
+        template=template, param_index=param_index, jobs=jobs, results=results, errors=errors,
+        parameter_tag=parameter_tag, parameters_with_imports=parameters_with_imports,
+        isolate=isolate, timeout=timeout, kernel_pool=kernel_pool,
+    )
+    max_workers = max(min(max_workers, len(parameters)), 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        workers = [pool.submit(_sweep_worker, **kwds_worker) for _ in range(max_workers)]
+        for worker in workers:
+            # Raise errors from setup
+            worker.result()
+
+    if not silence:
+        for error in errors:
+            if error is not None:
+                raise error
+    return results
+
+def parameter_grid(**kwargs):
+    """Get all combinations of the parameter values
+
+    Examples:
+    ---------
+        parameter_grid(category=["a", "b"], number=[1, 2])
+        >>> [
+            {'category': 'a', 'number': 1}, {'category': 'a', 'number': 2},
+            {'category': 'b', 'number': 1}, {'category': 'b', 'number': 2}
+        ]
+    """
+    names = list(kwargs)
+    return [
+        dict(zip(names, values))
+        for values in itertools.product(*kwargs.values())
+    ]
+
+def _sweep_worker(template, param_index, jobs, results, errors, parameter_tag, parameters_with_imports, isolate, timeout, kernel_pool):
+    "Run the setup cells once and the parameter sets from the queue"
+    path = os.path.dirname(template.file) if hasattr(template, "file") else None
+    with KernelSession(kernel_name=template.kernel_name, path=path, timeout=timeout, kernel_pool=kernel_pool) as session:
+        setup_cells = [copy.deepcopy(cell) for cell in template.cells[:param_index]]
+        for cell in setup_cells:
+            session.run(cell)
+        if isolate:
+            session.run(SNAPSHOT_CODE, silent=True)
+
+        while True:
+            try:
+                i, params = jobs.get_nowait()
+            except queue.Empty:
+                break
+            logger.debug(f"Running parameter set {i}: {params}")
+
+            nb = copy.deepcopy(template)
+            set_parameters(nb, params=params, parameter_tag=parameter_tag, include_imports=parameters_with_imports)
+            for cell_index, setup_cell in enumerate(setup_cells):
+                nb[cell_index] = copy.deepcopy(setup_cell)
+
+            try:
+                for cell in nb.cells[param_index:]:
+                    session.run(cell)
+            except CellExecutionError as exc:
+                errors[i] = exc
+            results[i] = nb
+
+            if isolate:
+                session.run(CLEANUP_CODE, silent=True)
+
+def _get_cell_index(notebook, **kwargs):
+    "Get index of the first cell matching given parameters"
+    for i, cell in enumerate(notebook.cells):
+        if utils.cell_match(cell, **kwargs):
+            return i
+    raise KeyError(f"No cell matching: {kwargs}")
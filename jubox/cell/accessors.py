@@ -1,5 +1,6 @@
 
 from . import code
+from jubox.io.blobs import has_blobs, resolve_outputs
 from jubox.utils.outputs import (
     output_match, 
     output_to_plain, output_to_html,
@@ -9,6 +10,8 @@ from jubox.utils.outputs import (
 @code.register_accessor("outputs")
 class Outputs:
 
+    __slots__ = ("_cell",)
+
     def __init__(self, cell):
         self._cell = cell
 
@@ -78,7 +81,7 @@ class Outputs:
         ])
 
     def __iter__(self):
-        for output in self._cell["outputs"]:
+        for output in self._get_outputs():
             yield output
 
     def __len__(self):
@@ -92,12 +95,24 @@ class Outputs:
 
 
     def __getitem__(self, item):
-        return self._cell["outputs"][item]
+        return self._get_outputs()[item]
 
     def __setitem__(self, item, val):
         "Set outputs in the cell"
-        self._cell["outputs"][item] = val
+        # Copy-on-write, the outputs may be shared (see jubox.utils.copy_node)
+        outputs = list(self._cell["outputs"])
+        outputs[item] = val
+        self._cell["outputs"] = outputs
 
     def __delitem__(self, item):
         "Delete an output"
-        del self._cell["outputs"][item]
\ No newline at end of file
+        outputs = list(self._cell["outputs"])
+        del outputs[item]
+        self._cell["outputs"] = outputs
+
+    def _get_outputs(self):
+        "Get the outputs with the large data resolved from the blob stores"
+        outputs = self._cell["outputs"]
+        if has_blobs(outputs):
+            resolve_outputs(outputs)
+        return outputs
@@ -27,17 +27,44 @@ logger = logging.getLogger(__name__)
 # Registries
 CELL_TYPES = {}
 CUSTOM_CELLS = [] # Meant for user defined special classes that take higher priority
+# User defined classes indexed by their dispatch rule
+CUSTOM_TAGS = {}
+CUSTOM_METADATA_KEYS = {}
+CUSTOM_PREDICATES = []
 
 class CellMeta(type):
     """
     Metaclass to register provided cell classes
     so that correct class is chosen when Notebook
     initiates individual cells from nodes
+
+    Custom cell classes can define a dispatch rule
+    that takes priority over the cell types:
+        dispatch_tag [str] : Tag of the cells to use the class for
+        dispatch_metadata_key [str] : Metadata key of the cells 
+            to use the class for
+        accepts [classmethod] : Predicate (node) whether to use 
+            the class for the cell
+    The class is used only for cells of its cell_type. Custom
+    classes without a dispatch rule (nor cell_type) are tried
+    to construct from the node until one does not raise TypeError.
     """
 
     def __new__(mcs, name, bases, class_dict):
 
         cls = type.__new__(mcs, name, bases, class_dict)
+        tag = getattr(cls, "dispatch_tag", None)
+        key = getattr(cls, "dispatch_metadata_key", None)
+        if tag is not None:
+            CUSTOM_TAGS.setdefault(tag, []).append(cls)
+            return cls
+        elif key is not None:
+            CUSTOM_METADATA_KEYS.setdefault(key, []).append(cls)
+            return cls
+        elif hasattr(cls, "accepts"):
+            CUSTOM_PREDICATES.append(cls)
+            return cls
+
         try:
             CELL_TYPES[cls.cell_type] = cls
         except AttributeError:
@@ -48,6 +75,34 @@ class CellMeta(type):
         return cls
 
 
+def has_dispatch_rule(cls):
+    "Whether the cell class has a dispatch rule (tag, metadata key or predicate)"
+    return (
+        getattr(cls, "dispatch_tag", None) is not None
+        or getattr(cls, "dispatch_metadata_key", None) is not None
+        or hasattr(cls, "accepts")
+    )
+
+def get_custom_class(node):
+    "Get the custom cell class (with a dispatch rule) for the node (or None)"
+    metadata = node.get("metadata", {})
+    candidates = []
+    if CUSTOM_TAGS:
+        for tag in metadata.get("tags", []):
+            candidates += CUSTOM_TAGS.get(tag, [])
+    if CUSTOM_METADATA_KEYS:
+        for key in metadata:
+            candidates += CUSTOM_METADATA_KEYS.get(key, [])
+    candidates += CUSTOM_PREDICATES
+
+    for cls in candidates:
+        if cls.cell_type != node["cell_type"]:
+            continue
+        if not hasattr(cls, "accepts") or cls.accepts(node):
+            return cls
+    return None
+
+
 class JupyterCell(JupyterObject, metaclass=CellMeta):
 
     """Humane API for Jupyter Notebook Cells
@@ -81,6 +136,8 @@ class JupyterCell(JupyterObject, metaclass=CellMeta):
             modifying the attribute "cell_type".
     """
 
+    __slots__ = ("_node", "_accessors")
+
     new_node_func = None
     cell_type = None
 
@@ -145,6 +202,10 @@ class JupyterCell(JupyterObject, metaclass=CellMeta):
         # JupyterNotebook uses this method
         # for interfacing thus modifications
         # with care
+        cls_custom = get_custom_class(node)
+        if cls_custom is not None:
+            return cls_custom(node)
+
         for cls_custom in CUSTOM_CELLS:
             try:
                 cell = cls_custom(node)
@@ -303,10 +364,10 @@ class JupyterCell(JupyterObject, metaclass=CellMeta):
         JupyterCell can only store data attribute. All other
         attributes should be class attributes or be put to 
         the data. This is only a convenient view to the cells"""
-        if attr != "_node":
+        if attr not in JupyterCell.__slots__:
             setattr(self._node, attr, val)
         else:
-            self.__dict__[attr] = val
+            object.__setattr__(self, attr, val)
 
 # Boolean functions
 # TODO: use these instead of functions in JupyterNotebook.get
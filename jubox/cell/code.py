@@ -33,6 +33,7 @@ class CodeCell(JupyterCell):
     Code cell in JupyterNotebook
     """
 
+    __slots__ = ()
     cell_type = "code"
 
     @classmethod
@@ -8,6 +8,7 @@ from jubox.base import JupyterObject
 from .base import JupyterCell
 
 class MarkdownCell(JupyterCell):
+    __slots__ = ()
     cell_type = "markdown"
 
     @classmethod
@@ -7,6 +7,7 @@ from jubox.base import JupyterObject
 from .base import JupyterCell
 
 class RawCell(JupyterCell):
+    __slots__ = ()
     cell_type = "raw"
 
     @classmethod
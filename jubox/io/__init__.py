@@ -0,0 +1,4 @@
+from .blobs import BlobStore
+from .intern import Interner
+from .jsonlib import register_backend
+from .cache import NotebookCache
@@ -0,0 +1,154 @@
+"""
+Content-addressed store for large outputs
+"""
+
+import os
+import re
+import hashlib
+import logging
+import weakref
+
+import nbformat
+
+from jubox.utils import copy_node
+
+logger = logging.getLogger(__name__)
+
+# Output metadata key for the blob references (mime type: key)
+BLOB_KEY = "jubox_blobs"
+_KEY_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+# Stores in use. Keys are content hashes thus
+# any store having the key can resolve it
+_STORES = weakref.WeakValueDictionary()
+
+class BlobStore:
+
+    """Content-addressed store for large output data
+
+    The output data (ie. base64 PNGs) larger than the
+    threshold are stored to files named by their SHA-256
+    and the notebook keeps only the references (in the 
+    output metadata). The references are resolved when 
+    the outputs are accessed using Jubox (ie. cell.outputs)
+    or the notebook is exported.
+
+    Attributes:
+    -----------
+        path [str, path-like] : Directory of the blobs
+        threshold [int] : Minimum size (characters) of output data to store
+
+    Examples:
+    ---------
+        store = BlobStore("blobs")
+        nb.to_ipynb("report.ipynb", blob_store=store)
+
+        nb = JupyterNotebook("report.ipynb")
+        nb.load(blob_store=store)
+    """
+
+    def __init__(self, path, threshold=64 * 1024):
+        self.path = str(path)
+        self.threshold = threshold
+        _STORES[os.path.abspath(self.path)] = self
+
+    def put(self, data):
+        "Store data (str) and get its key"
+        key = hashlib.sha256(data.encode("utf-8")).hexdigest()
+        file = self._get_file(key)
+        if not os.path.exists(file):
+            os.makedirs(os.path.dirname(file), exist_ok=True)
+            tmp_file = f"{file}.{os.getpid()}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(tmp_file, file)
+        return key
+
+    def get(self, key):
+        "Get data of a key"
+        with open(self._get_file(key), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def __contains__(self, key):
+        return is_key(key) and os.path.exists(self._get_file(key))
+
+    def offload(self, node):
+        """Get copy of a notebook node having the large
+        output data replaced with references to the store.
+        The outputs that are not offloaded are shared."""
+        node = copy_node(node)
+        for cell in node.cells:
+            outputs = cell.get("outputs")
+            if not outputs:
+                continue
+            if has_blobs(outputs) and not self._has_refs(outputs):
+                # Referenced blobs are in another store
+                resolve_outputs(outputs)
+            if any(self._is_large(output) for output in outputs):
+                cell["outputs"] = [self._offload_output(output) for output in outputs]
+        return node
+
+    def _has_refs(self, outputs):
+        return all(
+            key in self
+            for output in outputs
+            for key in output.get("metadata", {}).get(BLOB_KEY, {}).values()
+        )
+
+    def _is_large(self, output):
+        return any(
+            isinstance(value, str) and len(value) >= self.threshold
+            for value in output.get("data", {}).values()
+        )
+
+    def _offload_output(self, output):
+        if not self._is_large(output):
+            return output
+        output = nbformat.NotebookNode(output)
+        output["data"] = data = nbformat.NotebookNode(output["data"])
+        output["metadata"] = metadata = nbformat.NotebookNode(output.get("metadata", {}))
+        refs = dict(metadata.get(BLOB_KEY, {}))
+        for mime, value in data.items():
+            if isinstance(value, str) and len(value) >= self.threshold:
+                refs[mime] = self.put(value)
+                data[mime] = ""
+        metadata[BLOB_KEY] = refs
+        return output
+
+    def _get_file(self, key):
+        # The keys come from the notebooks thus untrusted
+        if not is_key(key):
+            raise ValueError(f"Invalid blob key: {key!r}")
+        return os.path.join(self.path, key[:2], key)
+
+def is_key(key):
+    "Whether the key is valid (SHA-256 hex digest)"
+    return isinstance(key, str) and _KEY_PATTERN.fullmatch(key) is not None
+
+def has_blobs(outputs):
+    "Whether the outputs have unresolved references to blobs"
+    return any(BLOB_KEY in output.get("metadata", {}) for output in outputs)
+
+def get_blob(key):
+    "Get data of a key from the stores in use"
+    for store in list(_STORES.values()):
+        if key in store:
+            return store.get(key)
+    raise KeyError(f"Blob not found from the stores: {key}")
+
+def resolve_outputs(outputs):
+    "Replace the references to the blobs with the data (in place)"
+    for output in outputs:
+        metadata = output.get("metadata", {})
+        if BLOB_KEY not in metadata:
+            continue
+        for mime, key in metadata[BLOB_KEY].items():
+            output["data"][mime] = get_blob(key)
+        del metadata[BLOB_KEY]
+
+def resolve_node(node):
+    "Replace the references to the blobs with the data in a notebook node (in place)"
+    for cell in node.cells:
+        outputs = cell.get("outputs")
+        if outputs and has_blobs(outputs):
+            resolve_outputs(outputs)
@@ -0,0 +1,134 @@
+"""
+On-disk cache for parsed notebooks
+"""
+
+import os
+import pickle
+import hashlib
+import logging
+
+from .files import write_file
+
+logger = logging.getLogger(__name__)
+
+class NotebookCache:
+
+    """Cache of parsed notebooks keyed by the file
+
+    The parsed notebook node is pickled to the cache keyed by the
+    absolute path, modification time and size of the notebook file
+    thus loading an unchanged file skips parsing and validation.
+    The least recently used entries are evicted when the total
+    size of the cache exceeds max_size (the total is counted from
+    the directory once and then kept up to date by the writes of
+    this instance). Use only a directory writable by trusted users
+    as the entries are pickles.
+
+    Attributes:
+    -----------
+        path [str, path-like] : Directory of the cache files
+        max_size [int] : Maximum total size (bytes) of the cache files
+
+    Examples:
+    ---------
+        nb = JupyterNotebook("notebook.ipynb")
+        nb.load(load_cache=NotebookCache(".jubox_cache/notebooks"))
+
+        # Or for all notebooks
+        JupyterNotebook.load_cache = NotebookCache(".jubox_cache/notebooks")
+    """
+
+    extension = ".pickle"
+
+    def __init__(self, path, max_size=256 * 1024 * 1024):
+        self.path = str(path)
+        self.max_size = max_size
+        self._size = None # Total size of the cache files (counted on first write)
+
+    def key(self, file):
+        "Get the key of a notebook file (absolute path, modification time & size)"
+        file = os.path.abspath(file)
+        stat = os.stat(file)
+        return (file, stat.st_mtime_ns, stat.st_size)
+
+    def get(self, key):
+        """Get cached data (node, hash & compression of the
+        file and whether the node was validated) or None"""
+        entry = self._get_file(key)
+        try:
+            with open(entry, "rb") as f:
+                if pickle.load(f) != key:
+                    # The file has changed
+                    return None
+                data = pickle.load(f)
+        except Exception:
+            # Corrupted or incompatible entry
+            return None
+        try:
+            # Mark as recently used
+            os.utime(entry)
+        except OSError:
+            pass
+        return data
+
+    def set(self, key, node, content_hash=None, compression=None, validated=False):
+        "Store a parsed notebook and evict the least recently used entries"
+        os.makedirs(self.path, exist_ok=True)
+        data = {
+            "node": node,
+            "hash": content_hash,
+            "compression": compression,
+            "validated": validated,
+        }
+        content = pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL) + pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        entry = self._get_file(key)
+        if self._size is None:
+            self._size = sum(stat.st_size for _, stat in self._get_entries())
+        try:
+            # Overwritten entry
+            self._size -= os.path.getsize(entry)
+        except OSError:
+            pass
+        write_file(entry, content, compression=None)
+        self._size += len(content)
+        if self._size > self.max_size:
+            self.evict()
+
+    def evict(self):
+        "Remove the least recently used entries exceeding the max_size"
+        entries = self._get_entries()
+        total = sum(stat.st_size for _, stat in entries)
+        for entry, stat in sorted(entries, key=lambda item: item[1].st_mtime_ns):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(entry)
+            except OSError:
+                continue
+            logger.debug(f"Evicted {entry} from the notebook cache")
+            total -= stat.st_size
+        self._size = total
+
+    def clear(self):
+        "Remove all cached notebooks"
+        for entry, _ in self._get_entries():
+            os.remove(entry)
+        self._size = 0
+
+    def _get_entries(self):
+        "Get the cache files and their stats"
+        if not os.path.isdir(self.path):
+            return []
+        entries = []
+        for item in os.scandir(self.path):
+            if item.name.endswith(self.extension):
+                try:
+                    entries.append((item.path, item.stat()))
+                except OSError:
+                    # Removed by another process
+                    pass
+        return entries
+
+    def _get_file(self, key):
+        name = hashlib.sha256(key[0].encode("utf-8")).hexdigest()
+        return os.path.join(self.path, name + self.extension)
@@ -0,0 +1,132 @@
+"""
+Reading and writing notebook files
+
+The files can be compressed with gzip (.ipynb.gz) or
+with Zstandard (.ipynb.zst, requires zstandard). The
+compression is detected from the magic bytes when read
+and from the extension when written.
+"""
+
+import os
+import gzip
+import shutil
+import hashlib
+import threading
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Compression by file extension
+EXTENSIONS = {
+    ".gz": "gzip",
+    ".zst": "zstd",
+}
+# Compression by the first bytes of the file
+MAGIC_BYTES = {
+    b"\x1f\x8b": "gzip",
+    b"\x28\xb5\x2f\xfd": "zstd",
+}
+
+_CHUNK_SIZE = 1024 * 1024
+
+def get_compression(file):
+    "Get the compression of a file to write from its extension (None if not compressed)"
+    return EXTENSIONS.get(os.path.splitext(os.fspath(file))[1].lower())
+
+def detect_compression(file):
+    "Detect the compression of an existing file from its magic bytes (None if not compressed)"
+    with open(file, "rb") as f:
+        head = f.read(4)
+    for magic, compression in MAGIC_BYTES.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+def read_file(file, compression="infer"):
+    """Read the (decompressed) content (bytes) of a file
+
+    Arguments:
+    ----------
+        file {str, path-like} : File to read
+        compression {str} : "gzip", "zstd", None (not compressed)
+            or "infer" (detect from the magic bytes)
+    """
+    if compression == "infer":
+        compression = detect_compression(file)
+    with open(file, "rb") as raw:
+        if compression is None:
+            return raw.read()
+        elif compression == "gzip":
+            with gzip.GzipFile(fileobj=raw, mode="rb") as f:
+                return f.read()
+        elif compression == "zstd":
+            _check_zstandard()
+            with zstandard.ZstdDecompressor().stream_reader(raw) as f:
+                return b"".join(iter(lambda: f.read(_CHUNK_SIZE), b""))
+    raise ValueError(f"Invalid compression: {compression!r}")
+
+def write_file(file, content, compression="infer"):
+    """Write content (str or bytes) to a file atomically: the
+    content is written (and synced to disk) to a temporary file in
+    the same directory which then replaces the file. A failed write
+    leaves the original file intact.
+
+    Arguments:
+    ----------
+        file {str, path-like} : File to write
+        content {str, bytes} : Content of the file. Strings are
+            encoded (and compressed) in chunks.
+        compression {str} : "gzip", "zstd", None (not compressed)
+            or "infer" (from the extension of the file)
+    """
+    file = os.fspath(file)
+    if compression == "infer":
+        compression = get_compression(file)
+    tmp_file = f"{file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_file, "wb") as raw:
+            if compression is None:
+                _write_chunks(raw, content)
+            elif compression == "gzip":
+                # Name of the file (not the temporary file) to the header
+                with gzip.GzipFile(filename=file, fileobj=raw, mode="wb") as f:
+                    _write_chunks(f, content)
+            elif compression == "zstd":
+                _check_zstandard()
+                with zstandard.ZstdCompressor().stream_writer(raw, closefd=False) as f:
+                    _write_chunks(f, content)
+            else:
+                raise ValueError(f"Invalid compression: {compression!r}")
+            # Content on disk before replacing the file
+            raw.flush()
+            os.fsync(raw.fileno())
+        if os.path.exists(file):
+            shutil.copymode(file, tmp_file)
+        os.replace(tmp_file, file)
+    except BaseException:
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+        raise
+
+def content_hash(content):
+    "Hash of the (decompressed) content (str or bytes) of a file"
+    digest = hashlib.blake2b(digest_size=16)
+    for chunk in _iter_chunks(content):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+def _write_chunks(f, content):
+    for chunk in _iter_chunks(content):
+        f.write(chunk)
+
+def _iter_chunks(content):
+    "Iterate the content as bytes in chunks to avoid copying the whole content"
+    for start in range(0, len(content), _CHUNK_SIZE):
+        chunk = content[start:start + _CHUNK_SIZE]
+        yield chunk.encode("utf-8") if isinstance(chunk, str) else chunk
+
+def _check_zstandard():
+    if zstandard is None:
+        raise ImportError("Zstandard compressed notebooks require zstandard (pip install zstandard)")
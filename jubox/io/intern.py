@@ -0,0 +1,57 @@
+"""
+Deduplication of strings between notebooks
+"""
+
+class Interner:
+
+    """Deduplicates the strings of notebook nodes
+
+    Identical strings (sources, output data, tracebacks etc.)
+    of the interned notebooks are replaced with a single
+    shared string thus memory of loaded notebooks scales 
+    with the unique content instead of the number of 
+    notebooks. The strings are kept as long as the interner.
+
+    Attributes:
+    -----------
+        min_length [int] : Minimum length of the strings to intern.
+            Short strings cost more to intern than they save.
+
+    Examples:
+    ---------
+        interner = Interner()
+        for file in files:
+            nb = JupyterNotebook(file)
+            nb.load(interner=interner)
+
+        # Or for all notebooks
+        JupyterNotebook.interner = Interner()
+    """
+
+    def __init__(self, min_length=32):
+        self.min_length = min_length
+        self._strings = {}
+
+    def intern(self, value):
+        "Get the shared instance of a string"
+        if len(value) < self.min_length:
+            return value
+        return self._strings.setdefault(value, value)
+
+    def intern_node(self, node):
+        "Replace the strings of a node (dict or list) with the shared instances (in place)"
+        items = node.items() if isinstance(node, dict) else enumerate(node)
+        for key, value in items:
+            if isinstance(value, str):
+                if len(value) >= self.min_length:
+                    node[key] = self._strings.setdefault(value, value)
+            elif isinstance(value, (dict, list)):
+                self.intern_node(value)
+        return node
+
+    def clear(self):
+        "Release the strings"
+        self._strings.clear()
+
+    def __len__(self):
+        return len(self._strings)
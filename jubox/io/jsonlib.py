@@ -0,0 +1,182 @@
+"""
+JSON backends for reading and writing notebooks
+"""
+
+import json
+import warnings
+
+import nbformat
+from nbformat.reader import get_version
+
+from .files import read_file, write_file
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONBackend:
+
+    """JSON library to read and write the notebooks with
+
+    Attributes:
+    -----------
+        name [str] : Name of the backend
+        loads [function] : Parse JSON (str or bytes) to dicts and lists
+        dumps [function] : Serialize dicts and lists to JSON (str)
+
+    Examples:
+    ---------
+        import ujson
+        register_backend("ujson", ujson.loads, lambda obj: ujson.dumps(obj, indent=1, sort_keys=True))
+    """
+
+    def __init__(self, name, loads, dumps):
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+
+    def __repr__(self):
+        return f"JSONBackend({self.name!r})"
+
+
+# Backends by name
+BACKENDS = {}
+# Fastest first (for "auto")
+PREFERRED = ["orjson"]
+# Optional backends falling back to json if not installed
+OPTIONAL = {"orjson"}
+
+def register_backend(name, loads, dumps):
+    "Register a JSON backend to read and write the notebooks with"
+    BACKENDS[name] = JSONBackend(name, loads, dumps)
+    return BACKENDS[name]
+
+def get_backend(name=None):
+    """Get a JSON backend by name
+
+    Arguments:
+    ----------
+        name {str, JSONBackend} : "json" (default, through nbformat),
+            "auto" (the fastest installed), "orjson" or a registered backend.
+            Optional backends that are not installed fall back to "json".
+    """
+    if isinstance(name, JSONBackend):
+        return name
+    name = "json" if name is None else name
+    if name == "auto":
+        for preferred in PREFERRED:
+            if preferred in BACKENDS:
+                return BACKENDS[preferred]
+        return BACKENDS["json"]
+    if name not in BACKENDS:
+        if name in OPTIONAL:
+            warnings.warn(f"JSON backend {name!r} is not installed, falling back to 'json'")
+            return BACKENDS["json"]
+        raise ValueError(f"Unknown JSON backend: {name!r}")
+    return BACKENDS[name]
+
+def reads(string, as_version=4, backend=None):
+    """Read a notebook from JSON (str or bytes) using the backend.
+    Notebooks read with other than "json" backend are not validated
+    by nbformat (see JupyterNotebook.validation)"""
+    backend = get_backend(backend)
+    if backend.name == "json":
+        return nbformat.reads(string, as_version=as_version)
+
+    nb_dict = backend.loads(string)
+    major, _ = get_version(nb_dict)
+    if major != 4:
+        # Older formats are converted by nbformat
+        return nbformat.reads(string, as_version=as_version)
+    node = nbformat.v4.to_notebook_json(nb_dict)
+    return nbformat.convert(node, as_version)
+
+def read(file, as_version=4, backend=None):
+    "Read a notebook file using the backend (see reads)"
+    return reads(read_file(file), as_version=as_version, backend=backend)
+
+def writes(node, backend=None, **kwargs):
+    """Serialize a notebook to JSON using the backend. The keyword
+    arguments are passed to nbformat.writes (with "json" backend)"""
+    backend = get_backend(backend)
+    if backend.name == "json":
+        string = nbformat.writes(node, **kwargs)
+    else:
+        string = backend.dumps(to_disk_format(node))
+    return string if string.endswith("\n") else string + "\n"
+
+def write(node, file, backend=None, **kwargs):
+    "Write a notebook to a file (atomically) using the backend (see writes)"
+    write_file(file, writes(node, backend=backend, **kwargs))
+
+def to_disk_format(node):
+    """Get the notebook in the format written to the files
+    (multiline strings split to lines and transient metadata
+    removed, see nbformat.v4.rwbase.split_lines & strip_transient)
+    without copying or modifying the unchanged parts of the node"""
+    disk = dict(node)
+    disk["metadata"] = _drop_keys(node["metadata"], ("orig_nbformat", "orig_nbformat_minor", "signature"))
+    disk["cells"] = [_cell_to_disk(cell) for cell in node["cells"]]
+    return disk
+
+def _cell_to_disk(cell):
+    # NOTE: items() parses the outputs of lazily loaded cells
+    disk = dict(cell.items())
+    if isinstance(disk.get("source"), str):
+        disk["source"] = disk["source"].splitlines(True)
+    disk["metadata"] = _drop_keys(disk["metadata"], ("trusted",))
+    if "attachments" in disk:
+        disk["attachments"] = {
+            name: _split_mimebundle(attachment)
+            for name, attachment in disk["attachments"].items()
+        }
+    if disk["cell_type"] == "code":
+        disk["outputs"] = [_output_to_disk(output) for output in disk["outputs"]]
+    return disk
+
+def _output_to_disk(output):
+    output_type = output["output_type"]
+    if output_type in ("execute_result", "display_data"):
+        disk = dict(output)
+        disk["data"] = _split_mimebundle(output.get("data", {}))
+        return disk
+    elif output_type == "stream" and isinstance(output["text"], str):
+        disk = dict(output)
+        disk["text"] = output["text"].splitlines(True)
+        return disk
+    return output
+
+def _split_mimebundle(data):
+    return {
+        key: value.splitlines(True)
+             if isinstance(value, str) and (key.startswith("text/") or key in ("application/javascript", "image/svg+xml"))
+             else value
+        for key, value in data.items()
+    }
+
+def _drop_keys(mapping, keys):
+    if not any(key in mapping for key in keys):
+        return mapping
+    return {key: value for key, value in mapping.items() if key not in keys}
+
+
+def _default(obj):
+    # As nbformat.v4.nbjson.BytesEncoder
+    if isinstance(obj, bytes):
+        return obj.decode("ascii")
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _json_dumps(obj):
+    return json.dumps(obj, indent=1, sort_keys=True, separators=(",", ": "), ensure_ascii=False, default=_default)
+
+# NOTE: Notebooks are read and written through nbformat with "json"
+register_backend("json", json.loads, _json_dumps)
+
+if orjson is not None:
+    def _orjson_dumps(obj):
+        # NOTE: orjson indents by 2 spaces only
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode("utf-8")
+
+    register_backend("orjson", orjson.loads, _orjson_dumps)
@@ -0,0 +1,296 @@
+"""
+Lazy loading of notebooks
+
+The notebook JSON is scanned once: the metadata and the
+sources and metadata of the cells are parsed but only the
+offsets of the outputs are indexed. The outputs of a cell
+are parsed when they are first accessed.
+"""
+
+import re
+import json
+import copy
+from json.decoder import scanstring
+
+import nbformat
+from nbformat.v4.rwbase import rejoin_lines, strip_transient
+
+from .files import read_file
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Run of JSON without brackets outside of the strings. Long strings
+# (ie. images) are not matched as str.find skips them faster
+_CONTENT = re.compile(r'(?:[^"\[\]{}]+|"[^"\\]{0,256}(?:\\.[^"\\]{0,256})*")*', re.S)
+
+_decoder = json.JSONDecoder()
+
+
+class LazyOutputs:
+
+    """Outputs of a cell to parse from the notebook JSON
+    on first access. Shared by the copies of the cell"""
+
+    __slots__ = ("_text", "_start", "_end", "_interner", "_outputs")
+
+    def __init__(self, text, start, end, interner=None):
+        self._text = text
+        self._start = start
+        self._end = end
+        self._interner = interner
+        self._outputs = None
+
+    def load(self):
+        "Parse the outputs (once)"
+        if self._outputs is None:
+            outputs = json.loads(self._text[self._start:self._end])
+            cell = nbformat.from_dict({"cell_type": "code", "outputs": outputs})
+            rejoin_lines(nbformat.NotebookNode(cells=[cell]))
+            if self._interner is not None:
+                self._interner.intern_node(cell.outputs)
+            self._outputs = cell.outputs
+            # Release the reference to the notebook JSON
+            self._text = None
+        return self._outputs
+
+
+class LazyCellNode(nbformat.NotebookNode):
+
+    """Cell node having its outputs parsed on first access
+
+    Accessing other keys of the cell does not parse the outputs
+    but operations on the whole cell (iterating, comparing,
+    copying deeply, serializing etc.) do.
+    """
+
+    def __init__(self, *args, lazy_outputs=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        object.__setattr__(self, "_lazy_outputs", lazy_outputs)
+
+    @property
+    def outputs_loaded(self):
+        "Whether the outputs are parsed"
+        return self._lazy_outputs is None
+
+    def _load_outputs(self):
+        lazy_outputs = self._lazy_outputs
+        if lazy_outputs is not None:
+            object.__setattr__(self, "_lazy_outputs", None)
+            dict.__setitem__(self, "outputs", lazy_outputs.load())
+
+    def __getitem__(self, key):
+        if key == "outputs":
+            self._load_outputs()
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        if key == "outputs":
+            self._load_outputs()
+        return super().get(key, default)
+
+    def __contains__(self, key):
+        if key == "outputs" and self._lazy_outputs is not None:
+            return True
+        return super().__contains__(key)
+
+    def __setitem__(self, key, value):
+        if key == "outputs":
+            object.__setattr__(self, "_lazy_outputs", None)
+        super().__setitem__(key, value)
+
+    def __copy__(self):
+        "Shallow copy sharing the (lazy) outputs"
+        return LazyCellNode(dict.items(self), lazy_outputs=self._lazy_outputs)
+
+    def __deepcopy__(self, memo):
+        self._load_outputs()
+        return copy.deepcopy(nbformat.NotebookNode(self), memo)
+
+    def __reduce__(self):
+        self._load_outputs()
+        return (nbformat.NotebookNode, (dict(self),))
+
+
+def _loading(name):
+    "Method of the cell node that needs the outputs"
+    method = getattr(nbformat.NotebookNode, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._load_outputs()
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = name
+    return wrapper
+
+for _name in (
+    "__iter__", "__len__", "__eq__", "__ne__", "__repr__", "__delitem__",
+    "keys", "values", "items", "pop", "popitem", "setdefault", "update", "copy",
+):
+    setattr(LazyCellNode, _name, _loading(_name))
+
+
+def read(file, interner=None):
+    "Read a notebook file lazily (see loads)"
+    return loads(read_file(file).decode("utf-8"), interner=interner)
+
+def loads(text, interner=None):
+    """Parse notebook JSON lazily: the outputs of the code cells
+    are parsed on first access. Notebooks of other formats than
+    version 4 are read fully. The notebook is not validated.
+
+    Arguments:
+    ----------
+        text {str} : Notebook JSON
+        interner {Interner} : Interner to deduplicate the strings with (optional)
+    """
+    node, end = _parse_object(text, 0, lambda key, idx: _parse_notebook_value(text, key, idx, interner))
+    if _WHITESPACE.match(text, end).end() != len(text):
+        raise json.JSONDecodeError("Extra data", text, end)
+
+    if node.get("nbformat") != 4:
+        # Old formats need conversion of the whole notebook
+        node = nbformat.reads(text, as_version=4)
+        if interner is not None:
+            interner.intern_node(node)
+        return node
+
+    cells = node.pop("cells", [])
+    node = nbformat.from_dict(node)
+    node["cells"] = cells
+    strip_transient(node)
+    if interner is not None:
+        for key, value in node.items():
+            if key != "cells" and isinstance(value, (dict, list)):
+                interner.intern_node(value)
+    return node
+
+def _parse_notebook_value(text, key, idx, interner):
+    if key == "cells":
+        return _parse_array(text, idx, lambda idx: _parse_cell(text, idx, interner))
+    return _decoder.raw_decode(text, idx)
+
+def _parse_cell(text, idx, interner):
+    "Parse a cell leaving the outputs unparsed"
+    spans = {}
+    def parse_value(key, idx):
+        if key == "outputs" and text[idx] == "[":
+            end = _skip_array(text, idx)
+            spans[key] = (idx, end)
+            return None, end
+        return _decoder.raw_decode(text, idx)
+
+    cell, end = _parse_object(text, idx, parse_value)
+    cell.pop("outputs", None)
+    cell = nbformat.from_dict(cell)
+    rejoin_lines(nbformat.NotebookNode(cells=[cell]))
+    if interner is not None:
+        interner.intern_node(cell)
+
+    if "outputs" in spans:
+        start, stop = spans["outputs"]
+        cell = LazyCellNode(cell, lazy_outputs=LazyOutputs(text, start, stop, interner=interner))
+    return cell, end
+
+def _parse_object(text, idx, parse_value):
+    "Parse JSON object at idx using parse_value(key, idx) -> (value, end)"
+    obj = {}
+    idx = _expect(text, idx, "{")
+    if text[idx:idx + 1] == "}":
+        return obj, idx + 1
+    while True:
+        idx = _expect(text, idx, '"')
+        key, idx = scanstring(text, idx)
+        idx = _expect(text, idx, ":")
+        obj[key], idx = parse_value(key, idx)
+        idx = _WHITESPACE.match(text, idx).end()
+        char = text[idx:idx + 1]
+        if char == "}":
+            return obj, idx + 1
+        elif char != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+        idx += 1
+
+def _parse_array(text, idx, parse_item):
+    "Parse JSON array at idx using parse_item(idx) -> (value, end)"
+    items = []
+    idx = _expect(text, idx, "[")
+    if text[idx:idx + 1] == "]":
+        return items, idx + 1
+    while True:
+        item, idx = parse_item(_WHITESPACE.match(text, idx).end())
+        items.append(item)
+        idx = _WHITESPACE.match(text, idx).end()
+        char = text[idx:idx + 1]
+        if char == "]":
+            return items, idx + 1
+        elif char != ",":
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, idx)
+        idx += 1
+
+def _skip_array(text, idx):
+    """Get the end of the JSON array at idx without parsing it. The
+    strings and the values between the brackets are skipped at once"""
+    depth = 0
+    while True:
+        idx = _CONTENT.match(text, idx).end()
+        char = text[idx:idx + 1]
+        if char == '"':
+            idx = _skip_string(text, idx + 1)
+            continue
+        elif char == "[":
+            end = _skip_flat_array(text, idx)
+            if end is not None:
+                if depth == 0:
+                    return end
+                idx = end
+                continue
+            depth += 1
+        elif char == "{":
+            depth += 1
+        elif char in ("]", "}"):
+            depth -= 1
+            if depth == 0:
+                return idx + 1
+        else:
+            raise json.JSONDecodeError("Unterminated array", text, idx)
+        idx += 1
+
+def _skip_flat_array(text, idx):
+    """Get the end of the JSON array at idx not containing brackets
+    (ie. lines of a stream) or None if it may contain them"""
+    end = text.find("]", idx + 1)
+    if end == -1:
+        return None
+    items = text[idx + 1:end]
+    if "[" in items or "{" in items or "}" in items:
+        return None
+    # The closing bracket is not in a string if there are even
+    # number of unescaped quotes before it
+    quotes = items.count('"')
+    escape = "\\"
+    sign = -1
+    while escape + '"' in items:
+        # Quotes preceded by odd number of backslashes are escaped
+        quotes += sign * items.count(escape + '"')
+        escape += "\\"
+        sign = -sign
+    return end + 1 if quotes % 2 == 0 else None
+
+def _skip_string(text, idx):
+    "Get the end of the JSON string starting at idx (after the quote)"
+    while True:
+        end = text.find('"', idx)
+        if end == -1:
+            raise json.JSONDecodeError("Unterminated string", text, idx)
+        # Escaped if preceded by odd number of backslashes
+        start = end
+        while start > idx and text[start - 1] == "\\":
+            start -= 1
+        if (end - start) % 2 == 0:
+            return end + 1
+        idx = end + 1
+
+def _expect(text, idx, char):
+    "Skip whitespace and the expected character"
+    idx = _WHITESPACE.match(text, idx).end()
+    if text[idx:idx + 1] != char:
+        raise json.JSONDecodeError(f"Expecting {char!r}", text, idx)
+    return _WHITESPACE.match(text, idx + 1).end() if char != '"' else idx + 1
@@ -0,0 +1,5 @@
+from .pool import KernelPool
+from .cache import CellCache
+from .preprocessor import ExecutePreprocessor, BudgetExceededError
+from .limits import OutputLimits
+from .session import KernelSession
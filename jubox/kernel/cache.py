@@ -0,0 +1,91 @@
+"""
+On-disk cache for outputs of executed code cells
+"""
+
+import os
+import json
+import hashlib
+import logging
+
+import nbformat
+
+logger = logging.getLogger(__name__)
+
+class CellCache:
+
+    """Content-hash cache for cell outputs
+
+    Each code cell is keyed by the hash of its source
+    and the hash of the code cells before it thus a
+    cell's entry is valid only if the cell and all
+    the code cells before it are unchanged.
+
+    Attributes:
+    -----------
+        path [str, path-like] : Directory of the cache files
+
+    Examples:
+    ---------
+        nb(inplace=True, cache=CellCache(".jubox_cache"))
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+
+    def hashes(self, cells, kernel_name=None):
+        "Get chained hashes of the code cells (index of the cell: hash)"
+        hashes = {}
+        prev = hashlib.sha256(str(kernel_name).encode("utf-8")).hexdigest()
+        for index, cell in enumerate(cells):
+            if cell["cell_type"] != "code":
+                continue
+            prev = hashlib.sha256((prev + cell["source"]).encode("utf-8")).hexdigest()
+            hashes[index] = prev
+        return hashes
+
+    def get(self, key):
+        "Get cached cell data (outputs & execution_count) or None if not cached"
+        file = self._get_file(key)
+        try:
+            with open(file, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return nbformat.from_dict(data)
+
+    def set(self, key, cell):
+        "Store outputs of a cell"
+        os.makedirs(self.path, exist_ok=True)
+        data = {
+            "outputs": cell["outputs"],
+            "execution_count": cell["execution_count"],
+        }
+        file = self._get_file(key)
+        tmp_file = file + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_file, file)
+
+    def get_prefix(self, cells, kernel_name=None):
+        """Get cached data for the unchanged prefix of the code cells
+        (index of the cell: cached data). The prefix ends at the
+        first code cell not found from the cache."""
+        cached = {}
+        for index, key in self.hashes(cells, kernel_name=kernel_name).items():
+            data = self.get(key)
+            if data is None:
+                break
+            cached[index] = data
+        logger.debug(f"Found {len(cached)} cached cells")
+        return cached
+
+    def clear(self):
+        "Remove all cached cells"
+        if not os.path.isdir(self.path):
+            return
+        for file in os.listdir(self.path):
+            if file.endswith(".json"):
+                os.remove(os.path.join(self.path, file))
+
+    def _get_file(self, key):
+        return os.path.join(self.path, f"{key}.json")
@@ -0,0 +1,164 @@
+"""
+Limits for the outputs collected during execution
+"""
+
+import os
+import uuid
+import logging
+from collections import defaultdict
+
+from nbformat.v4 import new_output
+
+logger = logging.getLogger(__name__)
+
+class OutputLimits:
+
+    """Limits for the outputs collected during execution
+
+    When a limit is hit, the stream text over the limit is 
+    truncated (or spilled to a file) and the outputs or images
+    over the limit are dropped. A marker output (stderr stream)
+    is left in place of the first truncated output of the cell.
+    The limits are for the whole execution: the outputs cleared 
+    (ie. by IPython.display.clear_output) still count.
+
+    Attributes:
+    -----------
+        stream_bytes [int] : Maximum bytes of stream text (stdout & stderr) per cell
+        outputs [int] : Maximum number of outputs per cell
+        image_bytes [int] : Maximum bytes of image data (base64) per cell
+        notebook_stream_bytes [int] : Maximum bytes of stream text per notebook
+        notebook_outputs [int] : Maximum number of outputs per notebook
+        notebook_image_bytes [int] : Maximum bytes of image data per notebook
+        spill_dir [str, path-like] : Directory to write the truncated
+            stream text to (optional). If not given, the text is discarded.
+
+    Examples:
+    ---------
+        nb(inplace=True, output_limits=OutputLimits(stream_bytes=10_000, outputs=100))
+    """
+
+    def __init__(self, stream_bytes=None, outputs=None, image_bytes=None,
+                 notebook_stream_bytes=None, notebook_outputs=None, notebook_image_bytes=None,
+                 spill_dir=None):
+        self.stream_bytes = stream_bytes
+        self.outputs = outputs
+        self.image_bytes = image_bytes
+        self.notebook_stream_bytes = notebook_stream_bytes
+        self.notebook_outputs = notebook_outputs
+        self.notebook_image_bytes = notebook_image_bytes
+        self.spill_dir = None if spill_dir is None else str(spill_dir)
+
+    def tracker(self):
+        "Get a tracker for the outputs of an execution"
+        return OutputTracker(self)
+
+
+class OutputTracker:
+
+    """Tracks the outputs of an execution and 
+    applies the limits to them"""
+
+    marker = "[Output truncated: {reason}]\n"
+
+    def __init__(self, limits):
+        self.limits = limits
+        self.cells = defaultdict(lambda: {"stream": 0, "outputs": 0, "image": 0})
+        self.total = {"stream": 0, "outputs": 0, "image": 0}
+        self._marked = set()
+        self._run_id = uuid.uuid4().hex[:8]
+
+    def add(self, outs, out, cell_index, removable=True):
+        """Apply the limits to an output appended to outs.
+        Returns the output or None if it was dropped"""
+        usage = self.cells[cell_index]
+        remaining = self._remaining(usage, "outputs", self.limits.outputs, self.limits.notebook_outputs)
+        if remaining is not None and remaining < 1 and removable:
+            self._drop(outs, out)
+            self._mark(outs, cell_index, "too many outputs")
+            return None
+        self._count(usage, "outputs", 1)
+
+        if out["output_type"] == "stream":
+            return self._limit_stream(outs, out, cell_index, removable)
+        if "data" in out:
+            return self._limit_images(outs, out, cell_index, removable)
+        return out
+
+    def _limit_stream(self, outs, out, cell_index, removable):
+        usage = self.cells[cell_index]
+        text = out["text"]
+        size = len(text.encode("utf-8"))
+        remaining = self._remaining(usage, "stream", self.limits.stream_bytes, self.limits.notebook_stream_bytes)
+        if remaining is None or size <= remaining:
+            self._count(usage, "stream", size)
+            return out
+
+        kept = text.encode("utf-8")[:max(remaining, 0)].decode("utf-8", errors="ignore")
+        self._count(usage, "stream", len(kept.encode("utf-8")))
+        spill_file = self._spill(text[len(kept):], cell_index, out["name"])
+        reason = "stream limit exceeded"
+        if spill_file is not None:
+            reason += f", full output in {spill_file}"
+
+        if kept or not removable:
+            out["text"] = kept
+        else:
+            self._drop(outs, out)
+            out = None
+        self._mark(outs, cell_index, reason)
+        return out
+
+    def _limit_images(self, outs, out, cell_index, removable):
+        usage = self.cells[cell_index]
+        images = [mime for mime in out["data"] if mime.startswith("image/")]
+        size = sum(len(out["data"][mime]) for mime in images)
+        if not size:
+            return out
+        remaining = self._remaining(usage, "image", self.limits.image_bytes, self.limits.notebook_image_bytes)
+        if remaining is None or size <= remaining:
+            self._count(usage, "image", size)
+            return out
+
+        for mime in images:
+            del out["data"][mime]
+        if not out["data"] and removable:
+            self._drop(outs, out)
+            out = None
+        self._mark(outs, cell_index, "image limit exceeded")
+        return out
+
+    def _remaining(self, usage, kind, cell_limit, notebook_limit):
+        "Remaining amount (None if unlimited)"
+        remaining = [
+            limit - used 
+            for limit, used in ((cell_limit, usage[kind]), (notebook_limit, self.total[kind]))
+            if limit is not None
+        ]
+        return min(remaining) if remaining else None
+
+    def _count(self, usage, kind, amount):
+        usage[kind] += amount
+        self.total[kind] += amount
+
+    def _drop(self, outs, out):
+        if outs and outs[-1] is out:
+            outs.pop()
+
+    def _mark(self, outs, cell_index, reason):
+        "Add marker output (once per cell and reason)"
+        if (cell_index, reason) in self._marked:
+            return
+        self._marked.add((cell_index, reason))
+        logger.warning(f"Cell {cell_index}: {reason}")
+        outs.append(new_output("stream", name="stderr", text=self.marker.format(reason=reason)))
+
+    def _spill(self, text, cell_index, name):
+        "Write the truncated text to a file. Returns the file (or None)"
+        if self.limits.spill_dir is None:
+            return None
+        os.makedirs(self.limits.spill_dir, exist_ok=True)
+        file = os.path.join(self.limits.spill_dir, f"{self._run_id}_cell{cell_index}_{name}.txt")
+        with open(file, "a", encoding="utf-8") as f:
+            f.write(text)
+        return file
@@ -0,0 +1,185 @@
+"""
+Pool of pre-started kernels to reuse between notebook executions
+"""
+
+import os
+import logging
+import threading
+from contextlib import contextmanager
+from collections import defaultdict, deque
+
+from jupyter_client.manager import start_new_kernel
+
+logger = logging.getLogger(__name__)
+
+class KernelPool:
+
+    """Pool of warm (pre-started) kernels
+
+    Starting a kernel is often slower than running a
+    short notebook. The pool keeps kernels running
+    between executions and resets their namespace
+    when they are returned to the pool.
+
+    Kernels are pooled by kernel name and at most
+    size of kernels per kernel name are kept idle.
+
+    Class attributes:
+    -----------
+        reset_code [str] : Code run in a kernel when
+            it is returned to the pool
+        chdir_code [str] : Code run in a kernel when it
+            is taken from the pool to a specific path.
+            Formatted with the path.
+
+    Attributes:
+    -----------
+        size [int] : Number of idle kernels kept per kernel name
+        hits [int] : Number of times an idle kernel was checked out
+        misses [int] : Number of times a new kernel had to be started
+
+    Examples:
+    ---------
+        pool = KernelPool(size=2, kernel_names=["python3"])
+        nb(inplace=True, kernel_pool=pool)
+        pool.stats
+        >>> {'size': 2, 'idle': 2, 'hits': 1, 'misses': 0}
+    """
+
+    reset_code = "%reset -f"
+    chdir_code = "import os as _os; _os.chdir({path!r}); del _os"
+
+    def __init__(self, size=1, kernel_names=None, startup_timeout=60):
+        self.size = size
+        self.startup_timeout = startup_timeout
+
+        self.hits = 0
+        self.misses = 0
+
+        self._idle = defaultdict(deque)
+        self._lock = threading.Lock()
+
+        for kernel_name in ([] if kernel_names is None else kernel_names):
+            self.fill(kernel_name)
+
+    def fill(self, kernel_name):
+        "Start kernels until there are size of idle kernels of given name"
+        while self.idle(kernel_name) < self.size:
+            km = self._start_kernel(kernel_name)
+            self._add_idle(km, kernel_name)
+
+    def acquire(self, kernel_name, path=None):
+        """Check out a kernel from the pool (or start
+        new one if there are no idle kernels)
+
+        Arguments:
+        ----------
+            kernel_name {str} : Name of the kernel
+            path {str} : Working directory for the kernel. If not given, 
+                current working directory is used (like for new kernels)
+        """
+        with self._lock:
+            kernels = self._idle[kernel_name]
+            km = None
+            while kernels and km is None:
+                km = kernels.popleft()
+                if not km.is_alive():
+                    logger.debug(f"Discarding dead kernel: {kernel_name}")
+                    km = None
+            if km is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if km is None:
+            km = self._start_kernel(kernel_name)
+
+        path = os.path.abspath(path) if path else os.getcwd()
+        self._run(km, self.chdir_code.format(path=str(path)))
+        return km
+
+    def release(self, km, kernel_name):
+        """Return a kernel to the pool. The kernel is
+        reset or shut down if the pool is full"""
+        with self._lock:
+            is_full = len(self._idle[kernel_name]) >= self.size
+
+        if is_full or not km.is_alive() or not self._run(km, self.reset_code):
+            self._shutdown_kernel(km)
+            return
+        self._add_idle(km, kernel_name)
+
+    @contextmanager
+    def kernel(self, kernel_name, path=None):
+        "Context manager to check out a kernel and return it afterwards"
+        km = self.acquire(kernel_name, path=path)
+        try:
+            yield km
+        finally:
+            self.release(km, kernel_name)
+
+    def shutdown(self):
+        "Shut down all idle kernels"
+        with self._lock:
+            kernels = [km for queue in self._idle.values() for km in queue]
+            self._idle.clear()
+        for km in kernels:
+            self._shutdown_kernel(km)
+
+    def idle(self, kernel_name=None):
+        "Number of idle kernels (of given kernel name)"
+        with self._lock:
+            if kernel_name is not None:
+                return len(self._idle[kernel_name])
+            return sum(len(queue) for queue in self._idle.values())
+
+    @property
+    def stats(self):
+        "Statistics of the pool"
+        return {
+            "size": self.size,
+            "idle": self.idle(),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.shutdown()
+
+# Internal
+    def _start_kernel(self, kernel_name):
+        logger.debug(f"Starting kernel: {kernel_name}")
+        km, kc = start_new_kernel(kernel_name=kernel_name, startup_timeout=self.startup_timeout)
+        kc.stop_channels()
+        return km
+
+    def _add_idle(self, km, kernel_name):
+        "Add the kernel to the idle kernels or shut it down if the pool was filled meanwhile"
+        with self._lock:
+            kernels = self._idle[kernel_name]
+            is_full = len(kernels) >= self.size
+            if not is_full:
+                kernels.append(km)
+        if is_full:
+            self._shutdown_kernel(km)
+
+    def _shutdown_kernel(self, km):
+        logger.debug("Shutting down kernel")
+        km.shutdown_kernel(now=True)
+
+    def _run(self, km, code):
+        "Run code silently in the kernel. Returns whether succeeded"
+        kc = km.client()
+        kc.start_channels()
+        try:
+            kc.wait_for_ready(timeout=self.startup_timeout)
+            reply = kc.execute_interactive(code, silent=True, store_history=False, timeout=self.startup_timeout)
+        except Exception:
+            logger.exception("Running code in pooled kernel failed")
+            return False
+        finally:
+            kc.stop_channels()
+        return reply["content"]["status"] == "ok"
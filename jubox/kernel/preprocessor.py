@@ -0,0 +1,411 @@
+"""
+Execution preprocessor with Jubox's extensions
+"""
+
+import time
+import asyncio
+import inspect
+import logging
+import datetime
+import warnings
+from contextlib import contextmanager
+
+from nbconvert import preprocessors
+from nbconvert.preprocessors import CellExecutionError
+from nbformat.v4 import output_from_msg
+from jupyter_client.jsonutil import parse_date
+
+from jubox.cell import JupyterCell
+from .limits import OutputLimits
+
+try:
+    # nbconvert>=6 executes using nbclient
+    from nbclient import NotebookClient
+    from nbclient.util import ensure_async, run_sync
+    from jupyter_client import AsyncKernelManager, AsyncKernelClient
+except ImportError:
+    NotebookClient = None
+
+logger = logging.getLogger(__name__)
+
+class BudgetExceededError(TimeoutError):
+    "The execution ran out of its wall-clock budget"
+
+class ExecutePreprocessor(preprocessors.ExecutePreprocessor):
+
+    """Executes the cells in a notebook
+
+    Extends nbconvert.preprocessors.ExecutePreprocessor
+
+    Attributes:
+    -----------
+        cache [CellCache] : Cache for the cell outputs (optional).
+            The unchanged prefix of code cells is restored from
+            the cache and replayed silently to the kernel only if
+            there are cells to execute after it.
+        on_cell_start [function] : Called before a code cell is executed 
+            with arguments cell (JupyterCell) and cell_index (optional)
+        on_output [function] : Called when the kernel emits an output
+            (stream, display data, execute result or error) with 
+            arguments output, cell and cell_index (optional).
+            Raising an exception interrupts the kernel and 
+            aborts the execution.
+        on_cell_end [function] : Called after a code cell is executed 
+            (or failed) with arguments cell and cell_index (optional)
+        timing_key [str] : Key of the cell metadata the timing of the
+            execution is recorded to: start and end (ISO format) and
+            duration of the execution in the kernel and queue_to_idle,
+            seconds from sending the cell to the kernel being idle
+        budget [float] : Wall-clock budget (seconds) of the whole
+            execution (optional). The cell running when the budget
+            runs out is interrupted and BudgetExceededError is raised
+            leaving the outputs collected so far to the notebook.
+        output_limits [OutputLimits, dict] : Limits for the collected
+            outputs per cell and per notebook (optional). See OutputLimits.
+
+    The timeout of a cell is read from the cell's metadata
+    (ie. {"timeout": 60}) or from a tag (ie. "timeout=60"),
+    falling back to the timeout of the preprocessor.
+    """
+
+    timeout_tag_prefix = "timeout="
+    timing_key = "timing"
+
+    def __init__(self, cache=None, on_cell_start=None, on_output=None, on_cell_end=None, budget=None, output_limits=None, **kwargs):
+        super().__init__(**kwargs)
+        self.timeout_func = self.get_cell_timeout
+        self.cache = cache
+        self.budget = budget
+        self.output_limits = OutputLimits(**output_limits) if isinstance(output_limits, dict) else output_limits
+        self._deadline = None
+        self._output_tracker = None
+        self._timing = None
+        self._hashes = {}
+        self._cached = {}
+
+        # NOTE: nbclient has traits with same names
+        self._callbacks = {
+            "on_cell_start": on_cell_start,
+            "on_output": on_output,
+            "on_cell_end": on_cell_end,
+        }
+
+    def preprocess(self, nb, resources=None, km=None):
+        self._start_budget()
+        self._start_output_limits()
+        if self._restore_cache(nb):
+            return nb, resources
+        try:
+            return super().preprocess(nb, resources, km=km)
+        finally:
+            if km is not None:
+                self._stop_client()
+
+    async def async_preprocess(self, nb, resources=None, km=None):
+        "Asynchronous version of preprocess"
+        if NotebookClient is None or not isinstance(self, NotebookClient):
+            raise ImportError("Asynchronous execution requires nbconvert>=6 (nbclient)")
+
+        self._start_budget()
+        self._start_output_limits()
+        if self._restore_cache(nb):
+            return nb, resources
+
+        # Reinitiate the execution state like in sync preprocess
+        NotebookClient.__init__(self, nb, km)
+        self.reset_execution_trackers()
+        self._check_assign_resources(resources)
+        try:
+            async with self.async_setup_kernel():
+                msg_id = await ensure_async(self.kc.kernel_info())
+                info_msg = await self.async_wait_for_reply(msg_id)
+                self.nb.metadata["language_info"] = info_msg["content"]["language_info"]
+                for index, cell in enumerate(self.nb.cells):
+                    await self.async_preprocess_cell(cell, resources, index)
+        finally:
+            if km is not None:
+                self._stop_client()
+        self.set_widgets_metadata()
+        return self.nb, self.resources
+
+    @contextmanager
+    def setup_session(self, nb, resources=None, km=None):
+        """Context manager to set up the kernel for 
+        executing the cells of nb one by one using
+        preprocess_cell"""
+        self._start_output_limits()
+        if NotebookClient is not None and isinstance(self, NotebookClient):
+            NotebookClient.__init__(self, nb, km)
+            self.reset_execution_trackers()
+            self._check_assign_resources(resources)
+            try:
+                with self.setup_kernel():
+                    yield
+            finally:
+                if km is not None:
+                    self._stop_client()
+        else:
+            with self.setup_preprocessor(nb, resources, km=km):
+                yield
+
+    async def async_start_new_kernel_client(self):
+        if isinstance(self.km, AsyncKernelManager):
+            return await super().async_start_new_kernel_client()
+
+        # Blocking client of a given kernel manager (ie. pooled)
+        # would block the event loop of nbclient while waiting
+        # for the outputs and thus the timeouts would not work
+        client_factory = self.km.client_factory
+        self.km.client_factory = AsyncKernelClient
+        try:
+            return await super().async_start_new_kernel_client()
+        finally:
+            self.km.client_factory = client_factory
+
+    if NotebookClient is not None:
+        start_new_kernel_client = run_sync(async_start_new_kernel_client)
+
+    def preprocess_cell(self, cell, resources, index, **kwargs):
+        self._check_budget()
+        if index in self._cached:
+            with self._budget_context():
+                self.replay_cell(cell, index)
+            self.restore_cell(cell, self._cached[index])
+            return cell, resources
+
+        is_executed = self._is_executed(cell)
+        if is_executed:
+            self._run_callback("on_cell_start", cell=cell, cell_index=index)
+            self._start_timing()
+        try:
+            with self._budget_context():
+                cell, resources = super().preprocess_cell(cell, resources, index, **kwargs)
+        finally:
+            if is_executed:
+                self._store_timing(cell)
+                self._run_callback("on_cell_end", cell=cell, cell_index=index)
+        self._store_cache(cell, index)
+        return cell, resources
+
+    async def async_preprocess_cell(self, cell, resources, index):
+        "Asynchronous version of preprocess_cell"
+        self._check_budget()
+        if index in self._cached:
+            with self._budget_context():
+                await self.async_replay_cell(cell, index)
+            self.restore_cell(cell, self._cached[index])
+            return cell, resources
+
+        is_executed = self._is_executed(cell)
+        if is_executed:
+            self._run_callback("on_cell_start", cell=cell, cell_index=index)
+            self._start_timing()
+
+        # nbclient turns cancellation of the execution to
+        # DeadKernelError thus the execution is shielded
+        # and cancelled separately
+        execution = asyncio.ensure_future(self.async_execute_cell(cell, index, store_history=True))
+        try:
+            with self._budget_context():
+                cell = await asyncio.shield(execution)
+        except asyncio.CancelledError:
+            execution.cancel()
+            await asyncio.wait([execution])
+            if not execution.cancelled():
+                execution.exception()
+            raise
+        finally:
+            if is_executed:
+                self._store_timing(cell)
+                self._run_callback("on_cell_end", cell=cell, cell_index=index)
+        self._store_cache(cell, index)
+        return cell, resources
+
+    def process_message(self, msg, cell, cell_index):
+        if self._timing is not None and msg["msg_type"] == "status":
+            state = msg["content"]["execution_state"]
+            if state in ("busy", "idle"):
+                self._timing[state] = (_get_msg_date(msg), time.monotonic())
+        return super().process_message(msg, cell, cell_index)
+
+    def output(self, outs, msg, display_id, cell_index):
+        out = super().output(outs, msg, display_id, cell_index)
+        if out is not None and self._output_tracker is not None:
+            out = self._output_tracker.add(outs, out, cell_index, removable=not display_id)
+            if out is None:
+                # Dropped by the limits
+                return out
+        if self._callbacks["on_output"] is not None:
+            if out is None:
+                try:
+                    out = output_from_msg(msg)
+                except ValueError:
+                    return out
+            try:
+                self._run_callback("on_output", output=out, cell=self.nb.cells[cell_index], cell_index=cell_index)
+            except Exception:
+                # Callback aborts the execution
+                self._interrupt_kernel()
+                raise
+        return out
+
+    def get_cell_timeout(self, cell):
+        """Get the timeout (seconds) of the cell from its metadata 
+        or tags bounded by the remaining budget. Invalid timeouts
+        in the metadata or tags are ignored with a warning"""
+        timeout = cell.get("metadata", {}).get("timeout", None)
+        if timeout is not None:
+            try:
+                timeout = float(timeout)
+            except (TypeError, ValueError):
+                warnings.warn(f"Ignoring invalid timeout metadata: {timeout!r}")
+                timeout = None
+        for tag in cell.get("metadata", {}).get("tags", []):
+            if tag.startswith(self.timeout_tag_prefix):
+                try:
+                    timeout = float(tag[len(self.timeout_tag_prefix):])
+                except ValueError:
+                    warnings.warn(f"Ignoring invalid timeout tag: {tag!r}")
+        if timeout is None:
+            timeout = self.timeout
+
+        remaining = self.remaining_budget
+        if remaining is not None:
+            # Zero or negative timeout is no timeout
+            timeout = remaining if not timeout or timeout < 0 else min(timeout, remaining)
+            # Zero would disable the timeout
+            timeout = max(timeout, 0.001)
+        return timeout
+
+    @property
+    def remaining_budget(self):
+        "Seconds left of the budget (None if no budget)"
+        if self._deadline is None:
+            return None
+        return self._deadline - time.monotonic()
+
+    def restore_cell(self, cell, data):
+        "Set cached outputs to the cell"
+        cell["outputs"] = data["outputs"]
+        cell["execution_count"] = data["execution_count"]
+
+    def replay_cell(self, cell, cell_index):
+        "Execute the cell silently (no outputs) to rebuild the kernel state"
+        if not cell["source"].strip():
+            return
+        msg_id = self.kc.execute(cell["source"], silent=True, store_history=False)
+        reply = self._wait_for_reply(msg_id, cell)
+        self._check_replay(cell, cell_index, reply)
+
+    async def async_replay_cell(self, cell, cell_index):
+        "Asynchronous version of replay_cell"
+        if not cell["source"].strip():
+            return
+        msg_id = await ensure_async(self.kc.execute(cell["source"], silent=True, store_history=False))
+        reply = await self.async_wait_for_reply(msg_id, cell)
+        self._check_replay(cell, cell_index, reply)
+
+# Internal
+    def _start_budget(self):
+        self._deadline = None if self.budget is None else time.monotonic() + self.budget
+
+    def _start_output_limits(self):
+        self._output_tracker = None if self.output_limits is None else self.output_limits.tracker()
+
+    def _check_budget(self):
+        remaining = self.remaining_budget
+        if remaining is not None and remaining <= 0:
+            raise BudgetExceededError(f"Execution exceeded the budget of {self.budget} seconds")
+
+    @contextmanager
+    def _budget_context(self):
+        "Turn a timeout caused by the budget to BudgetExceededError"
+        try:
+            yield
+        except TimeoutError as exc:
+            remaining = self.remaining_budget
+            if remaining is None or remaining > 0:
+                raise
+            # The kernel may be pooled thus the cell is stopped
+            self._interrupt_kernel()
+            raise BudgetExceededError(f"Execution exceeded the budget of {self.budget} seconds") from exc
+
+    def _start_timing(self):
+        self._timing = {"queued": time.monotonic()}
+
+    def _store_timing(self, cell):
+        timing, self._timing = self._timing, None
+        if timing is None or "busy" not in timing:
+            return
+        # The execution may have been stopped before idle
+        start, _ = timing["busy"]
+        end, idle = timing.get("idle", (None, None))
+        cell["metadata"][self.timing_key] = {
+            "start": start.isoformat(),
+            "end": end.isoformat() if end is not None else None,
+            "duration": (end - start).total_seconds() if end is not None else None,
+            "queue_to_idle": idle - timing["queued"] if idle is not None else None,
+        }
+
+    def _restore_cache(self, nb):
+        """Look up the cached cells and restore them if all
+        code cells are cached. Returns whether restored"""
+        if self.cache is None:
+            return False
+        self._hashes = self.cache.hashes(nb.cells, kernel_name=self.kernel_name)
+        self._cached = self.cache.get_prefix(nb.cells, kernel_name=self.kernel_name)
+
+        if self._hashes and len(self._cached) == len(self._hashes):
+            # All of the code cells are in the cache
+            # thus there is no need for a kernel
+            logger.debug("All cells found from cache, skipping the execution")
+            for index, data in self._cached.items():
+                self.restore_cell(nb.cells[index], data)
+            return True
+        return False
+
+    def _store_cache(self, cell, index):
+        if index in self._hashes and not any(output["output_type"] == "error" for output in cell["outputs"]):
+            self.cache.set(self._hashes[index], cell)
+
+    def _check_replay(self, cell, cell_index, reply):
+        # NOTE: jubox.builtin.notebook reads the cell & cell_index from the raising frame
+        if reply is not None and reply["content"]["status"] == "error":
+            raise CellExecutionError.from_cell_and_msg(cell, reply["content"])
+
+    def _is_executed(self, cell):
+        return cell["cell_type"] == "code" and bool(cell["source"].strip())
+
+    def _run_callback(self, name, cell, **kwargs):
+        callback = self._callbacks[name]
+        if callback is not None:
+            callback(cell=JupyterCell.from_node(cell), **kwargs)
+
+    def _interrupt_kernel(self):
+        interrupt = self.km.interrupt_kernel
+        if inspect.iscoroutinefunction(interrupt):
+            # Asynchronous kernel manager
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                run_sync(interrupt)()
+            else:
+                asyncio.ensure_future(interrupt())
+        else:
+            interrupt()
+
+    def _stop_client(self):
+        # Preprocessor leaves the client open
+        # if the kernel is not its own
+        kc = getattr(self, "kc", None)
+        if kc is not None:
+            kc.stop_channels()
+
+def _get_msg_date(msg):
+    "Get the time the kernel sent the message"
+    date = msg["header"].get("date")
+    if isinstance(date, str):
+        date = parse_date(date)
+    if not isinstance(date, datetime.datetime):
+        return datetime.datetime.now(datetime.timezone.utc)
+    return date
@@ -0,0 +1,116 @@
+"""
+Kernel kept alive for executing cells one by one
+"""
+
+import logging
+from contextlib import ExitStack
+
+from jubox.base import JupyterObject
+from jubox.cell import JupyterCell, CodeCell
+from .preprocessor import ExecutePreprocessor
+
+logger = logging.getLogger(__name__)
+
+class KernelSession(JupyterObject):
+
+    """Session of a kernel that is kept alive
+    between cell executions
+
+    The executed cells are kept in the session's
+    notebook and their outputs are written to the
+    nodes of the cells.
+
+    Attributes:
+    -----------
+        kernel_name [str] : Kernel to use
+        path [str, path-like] : Working directory of the kernel (optional)
+        timeout [int] : Timeout of a cell execution (seconds)
+        kernel_pool [KernelPool] : Pool to check out the kernel from (optional)
+        callbacks [dict] : Callbacks (on_cell_start, on_output & on_cell_end)
+            passed to the ExecutePreprocessor
+
+    Examples:
+    ---------
+        with KernelSession() as session:
+            session.run(CodeCell("x = 'foo'"))
+            cell = session.run(CodeCell("x + 'bar'"))
+        cell.outputs[0]["data"]["text/plain"]
+        >>> "'foobar'"
+    """
+
+    def __init__(self, kernel_name=None, path=None, timeout=None, kernel_pool=None, 
+                 on_cell_start=None, on_output=None, on_cell_end=None):
+        if kernel_name is not None:
+            self.kernel_name = kernel_name
+        self.path = path
+        self.timeout = timeout
+        self.kernel_pool = kernel_pool
+        self.callbacks = dict(on_cell_start=on_cell_start, on_output=on_output, on_cell_end=on_cell_end)
+
+        self._stack = None
+
+    def start(self):
+        "Start the kernel"
+        from jubox.notebook import JupyterNotebook # Circular import
+        if self.is_running:
+            raise RuntimeError("Session is already running")
+
+        self.notebook = JupyterNotebook()
+        self._ep = ExecutePreprocessor(kernel_name=self.kernel_name, timeout=self.timeout, **self.callbacks)
+        self._resources = {"metadata": {"path": None if self.path is None else str(self.path)}}
+
+        with ExitStack() as stack:
+            km = None
+            if self.kernel_pool is not None:
+                km = self.kernel_pool.acquire(self.kernel_name, path=self.path)
+                stack.callback(self.kernel_pool.release, km, self.kernel_name)
+            stack.enter_context(self._ep.setup_session(self.notebook.node, self._resources, km=km))
+            self._stack = stack.pop_all()
+
+    def run(self, cell, silent=False):
+        """Execute a cell in the kernel
+
+        Arguments:
+        ----------
+            cell {JupyterCell, str} : Cell to execute. String is turned to a CodeCell
+            silent {bool} : Whether to execute without outputs. Silent
+                executions are not stored to the session's notebook
+
+        Returns:
+        --------
+            JupyterCell : The executed cell
+        """
+        if not self.is_running:
+            raise RuntimeError("Session is not running. Use KernelSession.start or with statement")
+
+        cell = CodeCell(cell) if isinstance(cell, str) else cell
+        if not isinstance(cell, JupyterCell):
+            cell = JupyterCell.from_node(cell)
+
+        if silent:
+            self._ep.replay_cell(cell._node, None)
+            return cell
+
+        # Display updates are referenced by
+        # the index of the cell in the notebook
+        self.notebook.append(cell)
+        index = len(self.notebook) - 1
+        self._ep.preprocess_cell(cell._node, self._resources, index)
+        return cell
+
+    def shutdown(self):
+        "Shut down the kernel (or return it to the kernel pool)"
+        if self.is_running:
+            stack, self._stack = self._stack, None
+            stack.close()
+
+    @property
+    def is_running(self):
+        return self._stack is not None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        self.shutdown()
@@ -1,3 +1,4 @@
 from .notebook import JupyterNotebook
+from .collection import NotebookCollection
 
 from . import accessors 
\ No newline at end of file
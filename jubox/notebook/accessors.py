@@ -3,6 +3,8 @@ import copy
 
 from .notebook import JupyterNotebook, register_accessor
 from ..cell import JupyterCell
+from ..cell.base import get_custom_class, has_dispatch_rule
+from ..kernel import ExecutePreprocessor
 from jubox import utils 
 
 
@@ -14,6 +16,8 @@ class Cells:
     ---------
         nb.cells
     """
+    __slots__ = ("_nb",)
+
     def __init__(self, notebook):
         self._nb = notebook
 
@@ -58,22 +62,43 @@ class Cells:
             and cell.has_error
         ]
 
+    @property
+    def timings(self):
+        """Execution timings of the code cells recorded to
+        the cell metadata (see ExecutePreprocessor.timing_key)
+        return pandas.DataFrame indexed by cell_index (or List[dict]
+        if pandas is not installed)"""
+        key = ExecutePreprocessor.timing_key
+        columns = ["cell_index", "start", "end", "duration", "queue_to_idle"]
+        rows = [
+            dict(cell_index=i, **cell["metadata"][key])
+            for i, cell in enumerate(self._nb.node.cells)
+            if key in cell.get("metadata", {})
+        ]
+        try:
+            import pandas as pd
+        except ImportError:
+            return rows
+        return pd.DataFrame(rows, columns=columns).set_index("cell_index")
+
     def __getitem__(self, item):
         """Index cells in the notebook. 
         return List[JupyterCell]"""
 
-        if isinstance(item, (slice, int)):
-            return list(self)[item]
+        nodes = self._nb.node.cells
+        if isinstance(item, int):
+            return self._wrap(nodes[item])
+        elif isinstance(item, slice):
+            return [self._wrap(node) for node in nodes[item]]
         elif is_bool_array(item):
             return [
-                cell
-                for i, cell in enumerate(self)
+                self._wrap(node)
+                for i, node in enumerate(nodes)
                 if item[i]
             ]
         elif is_index_array(item):
-            cells = list(self)
             return [
-                cells[i]    
+                self._wrap(nodes[i])
                 for i in item
             ]
         else:
@@ -104,11 +129,13 @@ class Cells:
 
             for i in item:
                 node.cells[i] = values[i]
+        self._nb._dirty = True
 
     def __delitem__(self, item):
         "Delete a cell"
         node = self._nb.node
         del node.cells[item]
+        self._nb._dirty = True
 
     def __reversed__(self):
         orig_node = self._nb.node
@@ -118,7 +145,7 @@ class Cells:
 
     def __iter__(self):
         for cell in self._nb.node.cells:
-            yield JupyterCell.from_node(cell)
+            yield self._wrap(cell)
 
     def __len__(self):
         return len(self._nb.node.cells)
@@ -129,9 +156,56 @@ class Cells:
             for item in value
         ]
         self._nb.node.cells = values
+        self._nb._dirty = True
 
     def __delete__(self, instance):
         self._nb.node.cells = []
+        self._nb._dirty = True
+
+    @property
+    def dependencies(self):
+        """Dependency graph of the code cells from the names
+        the cells define and use (Python kernels)
+        return Dict[int, Set[int]] (index of cell: indexes of cells it depends on)"""
+        return utils.dependency_graph(self._nb.node.cells)
+
+    def get_downstream(self, indexes):
+        """Get indexes of the cells that depend on given cells
+        (directly or indirectly), including the given cells"""
+        indexes = [indexes] if isinstance(indexes, int) else indexes
+        return sorted(utils.get_downstream(self.dependencies, indexes))
+
+    def get_upstream(self, indexes):
+        """Get indexes of the cells given cells depend on
+        (directly or indirectly), including the given cells"""
+        indexes = [indexes] if isinstance(indexes, int) else indexes
+        return sorted(utils.get_upstream(self.dependencies, indexes))
+
+    def _wrap(self, node):
+        """Get JupyterCell of the cell node. The cells are 
+        cached by the identity of the node for the current 
+        list of cells of the notebook. The cell is wrapped
+        again if its type or dispatch (tags, metadata) 
+        changed. Custom classes without a dispatch rule 
+        are checked only when first wrapped."""
+        cells = self._nb.node.cells
+        cache = self._nb._cell_cache
+        if cache is None or cache[0] is not cells:
+            # The cells were replaced
+            cache = (cells, {})
+            self._nb._cell_cache = cache
+        wrappers = cache[1]
+
+        cell = wrappers.get(id(node))
+        if cell is None or cell._node is not node or cell.cell_type != node["cell_type"] or not _is_dispatched(cell, node):
+            if len(wrappers) > 2 * len(cells):
+                # Drop the cells removed from the list
+                ids = {id(item) for item in cells}
+                for key in [key for key in wrappers if key not in ids]:
+                    del wrappers[key]
+            cell = JupyterCell.from_node(node)
+            wrappers[id(node)] = cell
+        return cell
 
     def get(self, **kwargs):
         return [
@@ -146,6 +220,14 @@ class Cells:
         ]
 
 
+def _is_dispatched(cell, node):
+    "Whether the cell is of the class the dispatch rules give for the node"
+    cls = get_custom_class(node)
+    if cls is not None:
+        return type(cell) is cls
+    # Dispatched class whose rule no longer matches
+    return not has_dispatch_rule(type(cell))
+
 def is_bool_array(item):
     # Possibly use
     try:
@@ -0,0 +1,191 @@
+"""
+Collection of notebooks for bulk operations
+"""
+
+import os
+import glob
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from .notebook import JupyterNotebook
+
+logger = logging.getLogger(__name__)
+
+class NotebookCollection:
+
+    """Collection of notebooks loaded and processed concurrently
+
+    The notebooks are loaded and saved in a thread pool (reading,
+    parsing and writing the files). A failure of a file does not
+    abort the operation for the other files but is recorded to
+    NotebookCollection.errors.
+
+    Arguments:
+    ----------
+        notebooks {str, path-like, List[str, path-like, JupyterNotebook]} : Glob
+            pattern (ie. "notebooks/**/*.ipynb"), directory (notebooks
+            in it, compressed included) or list of notebooks or files
+        max_workers {int} : Maximum number of threads (optional)
+        kwds_load {dict} : Keyword arguments for JupyterNotebook.load
+            (ie. lazy=True)
+
+    Attributes:
+    -----------
+        notebooks [Dict[str, JupyterNotebook]] : The loaded notebooks by file
+        errors [Dict[str, Exception]] : The latest error of a file (loading
+            or an operation). Failed loads are not in the notebooks.
+
+    Examples:
+    ---------
+        nbs = NotebookCollection("notebooks/**/*.ipynb")
+        nbs.cells.get(tags=["parameters"])
+
+        nbs.clear_outputs()
+        nbs.save()
+        nbs.errors
+    """
+
+    patterns = ("*.ipynb", "*.ipynb.gz", "*.ipynb.zst")
+
+    def __init__(self, notebooks, max_workers=None, **kwds_load):
+        self.max_workers = max_workers
+        self.notebooks = {}
+        self.errors = {}
+
+        items = self._get_items(notebooks)
+        loaded = self._map(lambda item: self._load(item, **kwds_load), items)
+        for file in items:
+            if file in loaded:
+                self.notebooks[file] = loaded[file]
+
+    @property
+    def cells(self):
+        "Cells of the notebooks (see CollectionCells)"
+        return CollectionCells(self)
+
+    def clear_outputs(self, **kwargs):
+        "Clear all outputs in the notebooks"
+        self._map(lambda nb: nb.clear_outputs(inplace=True, **kwargs))
+
+    def save(self, force=False):
+        """Save the notebooks to their files. Unchanged
+        notebooks are not written (unless force)"""
+        self._map(lambda nb: nb.save(force=force))
+
+    def to_html(self, directory=None):
+        """Put the notebooks to HTML files to the directory
+        (or next to the notebooks). Returns the HTML files by notebook"""
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+        def to_html(nb, file):
+            html_file = _get_html_file(file, directory)
+            # The exporter keeps state of the notebook being
+            # exported thus it is not shared between the threads
+            exporter = type(nb.html_exporter)(config=nb.html_exporter.config)
+            nb.to_file(html_file, exporter=exporter)
+            return html_file
+        return self._map(to_html, with_file=True)
+
+    def __getitem__(self, item):
+        "Get notebook by file or by index"
+        if isinstance(item, int):
+            return list(self.notebooks.values())[item]
+        return self.notebooks[os.fspath(item)]
+
+    def __iter__(self):
+        return iter(self.notebooks.values())
+
+    def __len__(self):
+        return len(self.notebooks)
+
+    def __repr__(self):
+        return f"NotebookCollection({len(self.notebooks)} notebooks, {len(self.errors)} errors)"
+
+    def _get_items(self, notebooks):
+        "Get the notebooks (or files) by file"
+        if isinstance(notebooks, (str, os.PathLike)):
+            path = os.fspath(notebooks)
+            if os.path.isdir(path):
+                files = [file for pattern in self.patterns for file in glob.glob(os.path.join(path, pattern))]
+            else:
+                files = glob.glob(path, recursive=True)
+            return {file: file for file in sorted(files)}
+
+        items = {}
+        for i, item in enumerate(notebooks):
+            if isinstance(item, JupyterNotebook):
+                items[os.fspath(item.file) if hasattr(item, "file") else f"<notebook {i}>"] = item
+            else:
+                items[os.fspath(item)] = item
+        return items
+
+    def _load(self, notebook, **kwds_load):
+        nb = notebook if isinstance(notebook, JupyterNotebook) else JupyterNotebook(notebook)
+        if not hasattr(nb, "_node") or kwds_load:
+            nb.load(**kwds_load)
+        return nb
+
+    def _map(self, func, items=None, with_file=False):
+        """Call the function for the notebooks (or items by file) in a
+        thread pool recording the errors. Returns the results by file"""
+        items = self.notebooks if items is None else items
+        if not items:
+            return {}
+        max_workers = self.max_workers or min(32, (os.cpu_count() or 1) + 4)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+            futures = {
+                file: pool.submit(func, item, file) if with_file else pool.submit(func, item)
+                for file, item in items.items()
+            }
+        results = {}
+        for file, future in futures.items():
+            try:
+                results[file] = future.result()
+            except Exception as exc:
+                logger.warning(f"Failed notebook {file}: {exc!r}")
+                self.errors[file] = exc
+            else:
+                self.errors.pop(file, None)
+        return results
+
+
+class CollectionCells:
+
+    """Cells of the notebooks in a collection
+
+    Examples:
+    ---------
+        nbs.cells.get(tags=["parameters"])
+    """
+
+    def __init__(self, collection):
+        self._collection = collection
+
+    def get(self, **kwargs):
+        """Get the matching cells (see jubox.utils.cell_match)
+        return Dict[str, List[JupyterCell]] (notebooks having matches)"""
+        matches = {}
+        for file, nb in self._collection.notebooks.items():
+            cells = nb.cells.get(**kwargs)
+            if cells:
+                matches[file] = cells
+        return matches
+
+    def __iter__(self):
+        "Iterate (file, cell) pairs"
+        for file, nb in self._collection.notebooks.items():
+            for cell in nb.cells:
+                yield file, cell
+
+    def __len__(self):
+        return sum(len(nb.cells) for nb in self._collection)
+
+
+def _get_html_file(file, directory=None):
+    name = os.path.basename(os.fspath(file))
+    for extension in (".gz", ".zst", ".ipynb"):
+        if name.endswith(extension):
+            name = name[:-len(extension)]
+    name += ".html"
+    return os.path.join(os.path.dirname(os.fspath(file)) if directory is None else directory, name)
@@ -9,6 +9,8 @@ See official documents for nbformat structure:
 import re
 import os
 import copy
+import asyncio
+import functools
 import logging
 import warnings
 
@@ -21,6 +23,11 @@ from nbconvert import preprocessors
 from pathlib import Path
 
 from jubox.cell import JupyterCell
+from jubox.kernel import ExecutePreprocessor, CellCache
+from jubox.io import blobs
+from jubox.io import lazy as lazy_io
+from jubox.io import jsonlib, files
+from jubox.io.cache import NotebookCache
 from jubox.base import JupyterObject
 from jubox import utils
 
@@ -43,11 +50,39 @@ class JupyterNotebook(JupyterObject):
             form HTML version of the notebook. Override for
             custom formatting.
             see https://nbconvert.readthedocs.io/en/latest/api/exporters.html#nbconvert.exporters.HTMLExporter
+        kernel_pool [KernelPool] : Pool of warm kernels to use in 
+            execution (optional). If None, new kernel is started 
+            for each execution.
+        blob_store [BlobStore] : Store for large output data (optional).
+            If set, the notebook is saved with references to the store
+            in place of the large data. See jubox.io.BlobStore
+        interner [Interner] : Interner to deduplicate the strings of 
+            the loaded notebooks with (optional). See jubox.io.Interner
+        validation [str] : When the node is validated against the
+            notebook format: "eager" (when the node is set), "deferred"
+            (when the notebook is saved) or "off". With "eager", the
+            notebook is not validated again unless it has been changed 
+            using Jubox's methods or the node is set. Use 
+            JupyterNotebook.validate to validate after modifying the 
+            node directly. With "deferred", the notebook is validated
+            also if its content changed after the previous validation
+            (ie. edited cells).
+        json_backend [str] : JSON library to read and write the notebooks
+            with: "json" (nbformat's default), "auto" (the fastest installed),
+            "orjson" or registered with jubox.io.register_backend. Optional 
+            libraries that are not installed fall back to "json".
+        load_cache [NotebookCache] : Cache for the parsed notebooks (optional).
+            Unchanged files are loaded from the cache. See jubox.io.NotebookCache
+        lazy [bool] : Whether to load the notebooks lazily: the outputs
+            of the cells are parsed when first accessed and the validation 
+            is deferred to saving. See JupyterNotebook.load
 
     Attributes:
     -----------
         node [nbformat.notebooknode.NotebookNode] : Notebook data
-        file [str, path-like] : File for the notebook (optional)
+        file [str, path-like] : File for the notebook (optional). The file
+            can be compressed with gzip (ie. .ipynb.gz) or with Zstandard 
+            (ie. .ipynb.zst, requires zstandard)
     
     Properties:
     -----------
@@ -62,13 +97,34 @@ class JupyterNotebook(JupyterObject):
 
 
     html_exporter = exporters.HTMLExporter()
+    kernel_pool = None
+    blob_store = None
+    interner = None
+    validation = "eager"
+    lazy = False
+    json_backend = "json"
+    load_cache = None
+
+    # Whether changed after validation
+    _dirty = True
+    # Whether loaded lazily thus validated when saved
+    _lazy_loaded = False
+    # Hash of the file content when validated (see _to_json)
+    _validated_hash = None
+    # Hash of the file content when loaded or saved
+    _saved_hash = None
+    # Compression of the loaded file (see jubox.io.files)
+    _compression = "infer"
+    # Cached JupyterCells of the cell nodes (see Cells accessor)
+    _cell_cache = None
 
     def __init__(self, notebook=None):
         if isinstance(notebook, nbformat.notebooknode.NotebookNode):
             logger.debug("Initiating notebook from nbformat.notebooknode.NotebookNode")
             self.node = notebook
         elif isinstance(notebook, JupyterNotebook):
-            self.node = notebook.node
+            # Same node thus same validation state
+            self._set_node(notebook.node, dirty=notebook._dirty)
             if hasattr(notebook, "file"):
                 self.file = notebook.file
         elif notebook is None:
@@ -84,28 +140,174 @@ class JupyterNotebook(JupyterObject):
             self.file = notebook
 
 # Generic
-    def __call__(self, *args, metadata=None, timeout=None, inplace=False, ignore=None, **kwargs):
-        "Execute the code in the notebook"
-        if ignore is not None:
+    def __call__(self, *args, metadata=None, timeout=None, budget=None, output_limits=None, inplace=False, ignore=None, changed=None, kernel_pool=None, cache=None, 
+                 on_cell_start=None, on_output=None, on_cell_end=None, **kwargs):
+        """Execute the code in the notebook
+
+        Arguments:
+        ----------
+            metadata {dict} : Metadata for the execution (ie. path)
+            timeout {int} : Timeout of a cell execution (seconds). Cells can override it
+                with metadata (ie. {"timeout": 60}) or with a tag (ie. "timeout=60")
+            budget {float} : Wall-clock budget of the whole execution (seconds). When it runs
+                out the execution is stopped and jubox.kernel.BudgetExceededError is raised
+                leaving the partial outputs to the cells (optional)
+            output_limits {OutputLimits, dict} : Limits for the outputs collected per cell and 
+                per notebook (stream bytes, number of outputs & image bytes). Outputs over the 
+                limits are truncated or dropped and a marker output is left, see 
+                jubox.kernel.OutputLimits (optional)
+            inplace {bool} : Whether to execute the notebook in place or return executed copy
+            ignore {dict} : Identification of the cells not to execute, see jubox.utils.cell_match
+            changed {int, List[int]} : Indexes of changed cells. Only the cells depending on them 
+                (see JupyterNotebook.cells.dependencies) and the cells these depend on are executed
+            kernel_pool {KernelPool} : Pool of warm kernels to use (optional)
+            cache {CellCache, str, path-like} : Cache (or its directory) for cell outputs. The 
+                unchanged prefix of code cells is restored from the cache instead of run (optional)
+            on_cell_start {function} : Called with cell and cell_index before a code cell is run (optional)
+            on_output {function} : Called with output, cell and cell_index when the kernel 
+                emits an output (optional). Raising an exception aborts the execution.
+            on_cell_end {function} : Called with cell and cell_index after a code cell is run (optional)
+        """
+        if ignore is not None or changed is not None:
             # Should not operate on copy thus running subset
             # of the notebook will have the outputs for the
             # full notebook 
-            nb_main = copy.deepcopy(self) if not inplace else self
-            nb_subset = nb_main.drop(inplace=False, **ignore)
-            nb_subset(*args, metadata=metadata, timeout=timeout, inplace=True, ignore=None, **kwargs)
+            nb_main = self._copy() if not inplace else self
+            nb_subset, indexes = nb_main._get_subset(ignore=ignore, changed=changed)
+            callbacks = _map_cell_indexes(indexes, on_cell_start=on_cell_start, on_output=on_output, on_cell_end=on_cell_end)
+            nb_subset(
+                *args, metadata=metadata, timeout=timeout, budget=budget, output_limits=output_limits, inplace=True, kernel_pool=kernel_pool, cache=cache, 
+                **callbacks, **kwargs
+            )
             return None if inplace else nb_main
 
-        node = copy.deepcopy(self.node) if not inplace else self.node
+        node = utils.copy_node(self.node) if not inplace else self.node
+        ep, resources = self._get_preprocessor(
+            metadata=metadata, timeout=timeout, budget=budget, output_limits=output_limits, cache=cache, 
+            on_cell_start=on_cell_start, on_output=on_output, on_cell_end=on_cell_end
+        )
+
+        kernel_pool = self.kernel_pool if kernel_pool is None else kernel_pool
+        if kernel_pool is None:
+            ep.preprocess(node, resources)
+        else:
+            with kernel_pool.kernel(self.kernel_name, path=resources["metadata"]["path"]) as km:
+                ep.preprocess(node, resources, km=km)
+
+        if not inplace:
+            return JupyterNotebook.from_node(node)
+
+    async def execute_async(self, metadata=None, timeout=None, budget=None, output_limits=None, inplace=False, ignore=None, changed=None, kernel_pool=None, cache=None,
+                            on_cell_start=None, on_output=None, on_cell_end=None):
+        """Execute the code in the notebook asynchronously.
+        See JupyterNotebook.__call__ for the arguments
+
+        Examples:
+        ---------
+            nb_run = await nb.execute_async()
+
+            # Limit the duration of the whole execution
+            nb_run = await asyncio.wait_for(nb.execute_async(), timeout=60)
+        """
+        if ignore is not None or changed is not None:
+            nb_main = self._copy() if not inplace else self
+            nb_subset, indexes = nb_main._get_subset(ignore=ignore, changed=changed)
+            callbacks = _map_cell_indexes(indexes, on_cell_start=on_cell_start, on_output=on_output, on_cell_end=on_cell_end)
+            await nb_subset.execute_async(
+                metadata=metadata, timeout=timeout, budget=budget, output_limits=output_limits, inplace=True, kernel_pool=kernel_pool, cache=cache,
+                **callbacks
+            )
+            return None if inplace else nb_main
+
+        node = utils.copy_node(self.node) if not inplace else self.node
+        ep, resources = self._get_preprocessor(
+            metadata=metadata, timeout=timeout, budget=budget, output_limits=output_limits, cache=cache, 
+            on_cell_start=on_cell_start, on_output=on_output, on_cell_end=on_cell_end
+        )
+
+        kernel_pool = self.kernel_pool if kernel_pool is None else kernel_pool
+        if kernel_pool is None:
+            await ep.async_preprocess(node, resources)
+        else:
+            # Starting and resetting pooled kernels is blocking
+            loop = asyncio.get_running_loop()
+            acquire = functools.partial(kernel_pool.acquire, self.kernel_name, path=resources["metadata"]["path"])
+            km = await loop.run_in_executor(None, acquire)
+            try:
+                await ep.async_preprocess(node, resources, km=km)
+            finally:
+                await loop.run_in_executor(None, kernel_pool.release, km, self.kernel_name)
+
+        if not inplace:
+            return JupyterNotebook.from_node(node)
+
+    @classmethod
+    def _intern(cls, node, interner=None):
+        interner = cls.interner if interner is None else interner
+        if interner is not None:
+            interner.intern_node(node)
+        return node
+
+    def _to_json(self, blob_store=None, json_backend=None, **kwargs):
+        """Get the content of the notebook file (see to_ipynb). With 
+        deferred validation, the notebook is validated if changed using
+        Jubox's methods or if the content changed after the previous
+        validation (the cells do not mark the notebook changed)"""
+        deferred = self.validation == "deferred" or (self._lazy_loaded and self.validation != "off")
+        validated = deferred and self._dirty
+        if validated:
+            self.validate()
+
+        blob_store = self.blob_store if blob_store is None else blob_store
+        if blob_store:
+            node = blob_store.offload(self.node)
+        else:
+            node = self._resolve_blobs()
+        json_backend = self.json_backend if json_backend is None else json_backend
+        content = jsonlib.writes(node, backend=json_backend, **kwargs)
+
+        if deferred:
+            content_hash = files.content_hash(content)
+            if not validated and content_hash != self._validated_hash:
+                self.validate()
+            self._validated_hash = content_hash
+        return content
+
+    def _resolve_blobs(self):
+        "Get the node having the references to the blob stores resolved"
+        blobs.resolve_node(self.node)
+        return self.node
+
+    def _copy(self):
+        "Copy-on-write copy of the notebook (see jubox.utils.copy_node)"
+        nb = copy.copy(self)
+        nb._node = utils.copy_node(self.node)
+        nb._cell_cache = None
+        return nb
+
+    def _get_subset(self, ignore=None, changed=None):
+        """Get notebook of the cells to execute (sharing the cell nodes)
+        and the indexes of its cells in the notebook"""
+        nb = self
+        if changed is not None:
+            indexes = self.cells.get_upstream(self.cells.get_downstream(changed))
+            nb = JupyterNotebook.from_cells(self.cells[indexes])
+        if ignore is not None:
+            nb = nb.drop(inplace=False, **ignore)
+        positions = {id(cell): index for index, cell in enumerate(self.node.cells)}
+        return nb, [positions[id(cell)] for cell in nb.node.cells]
 
+    def _get_preprocessor(self, metadata=None, timeout=None, cache=None, **kwargs):
+        "Get the execution preprocessor and its resources"
         param_metadata = {} if metadata is None else metadata
         metadata = {"path": os.path.dirname(self.file) if hasattr(self, "file") else None}
         metadata.update(param_metadata)
 
-        ep = preprocessors.ExecutePreprocessor(kernel_name=self.kernel_name, timeout=timeout)
-        out = ep.preprocess(node, {'metadata': metadata})
+        if cache is not None and not isinstance(cache, CellCache):
+            cache = CellCache(cache)
 
-        if not inplace:
-            return JupyterNotebook.from_node(node)
+        ep = ExecutePreprocessor(kernel_name=self.kernel_name, timeout=timeout, cache=cache, **kwargs)
+        return ep, {'metadata': metadata}
 
     def __enter__(self):
         self.load()
@@ -136,6 +338,7 @@ class JupyterNotebook(JupyterObject):
         else:
             values = [elem._node if isinstance(elem, JupyterCell) else elem for elem in val]
             self.node.cells[item] = values
+        self._dirty = True
 
     def __delitem__(self, item):
         "Delete a cell"
@@ -152,14 +355,91 @@ class JupyterNotebook(JupyterObject):
         return iter(self.cells)
 
 # IO
-    def load(self):
-        "(Re)load the notebook"
-        # NOTE: nbformat.read does not like pathlib.Path
-        self.node = nbformat.read(str(self.file), as_version=self.nb_version)
-
-    def save(self):
-        "Save the notebook to original path"
-        self.to_ipynb(file=self.file)
+    def load(self, blob_store=None, interner=None, lazy=None, json_backend=None, load_cache=None):
+        """(Re)load the notebook
+
+        Arguments:
+        ----------
+            blob_store {BlobStore} : Store to resolve the references 
+                to large output data from and to save them to (optional)
+            interner {Interner} : Interner to deduplicate the strings with
+                (optional, defaults to JupyterNotebook.interner)
+            lazy {bool} : Whether to parse the notebook metadata and the
+                sources and metadata of the cells only. The outputs of 
+                a cell are parsed when first accessed. The notebook is 
+                validated when saved as with validation "deferred" unless 
+                the validation is "off" (optional, defaults to JupyterNotebook.lazy)
+            json_backend {str} : JSON library to parse the notebook with
+                (optional, defaults to JupyterNotebook.json_backend). Not used
+                in lazy loading.
+            load_cache {NotebookCache, str, path-like} : Cache (or its directory) 
+                for the parsed notebooks. Unchanged files are loaded from the 
+                cache skipping parsing and validation (optional, defaults to 
+                JupyterNotebook.load_cache). Not used in lazy loading.
+
+        Examples:
+        ---------
+            # Find parameter cells without parsing the outputs
+            nb = JupyterNotebook("notebook.ipynb")
+            nb.load(lazy=True)
+            nb.cells.get(tags=["parameters"])
+        """
+        if blob_store is not None:
+            self.blob_store = blob_store
+        lazy = self.lazy if lazy is None else lazy
+        load_cache = self.load_cache if load_cache is None else load_cache
+        if load_cache is not None and not isinstance(load_cache, NotebookCache):
+            load_cache = NotebookCache(load_cache)
+
+        if load_cache is not None and not lazy:
+            cache_key = load_cache.key(self.file)
+            cached = load_cache.get(cache_key)
+            if cached is not None:
+                logger.debug("Loading notebook from cache")
+                self._set_node(self._intern(cached["node"], interner=interner), dirty=not cached["validated"])
+                self._saved_hash = cached["hash"]
+                self._validated_hash = None if self._dirty else self._saved_hash
+                self._compression = cached["compression"]
+                return
+
+        compression = files.detect_compression(self.file)
+        content = files.read_file(self.file, compression=compression)
+        if lazy:
+            interner = self.interner if interner is None else interner
+            # Validation would parse the outputs
+            self._node = lazy_io.loads(content.decode("utf-8"), interner=interner)
+            self._dirty = True
+            self._lazy_loaded = True
+        else:
+            json_backend = self.json_backend if json_backend is None else json_backend
+            node = jsonlib.reads(content, as_version=self.nb_version, backend=json_backend)
+            self.node = self._intern(node, interner=interner)
+        self._saved_hash = files.content_hash(content)
+        self._validated_hash = None if self._dirty else self._saved_hash
+        self._compression = compression
+
+        if load_cache is not None and not lazy:
+            load_cache.set(
+                cache_key, self._node, 
+                content_hash=self._saved_hash, compression=compression, validated=not self._dirty
+            )
+
+    def save(self, force=False):
+        """Save the notebook to original path. The file is not
+        written if its content would not change from when it was
+        loaded or saved (unless force). The file is replaced 
+        atomically thus a failed save leaves the original intact.
+        The compression of the loaded file is kept."""
+        if not force and not hasattr(self, "_node"):
+            # Not loaded thus not changed
+            return
+        content = self._to_json()
+        content_hash = files.content_hash(content)
+        if not force and content_hash == self._saved_hash and os.path.exists(self.file):
+            logger.debug("Notebook unchanged, skipping saving")
+            return
+        files.write_file(self.file, content, compression=self._compression)
+        self._saved_hash = content_hash
 
 #   Specific file types
     def to_html(self, file, **kwargs):
@@ -181,14 +461,28 @@ class JupyterNotebook(JupyterObject):
         exporter = exporters.PDFExporter(**kwargs)
         self.to_file(file, exporter=exporter)
         
-    def to_ipynb(self, file, **kwargs):
-        "Put the notebook to a Jupyter Notebook file"
-        nbformat.write(self.node, str(file), **kwargs)
+    def to_ipynb(self, file, blob_store=None, json_backend=None, **kwargs):
+        """Put the notebook to a Jupyter Notebook file
+
+        Arguments:
+        ----------
+            file {str, path-like} : File to write. Files ending with .gz or .zst
+                are compressed with gzip or Zstandard (requires zstandard)
+            blob_store {BlobStore, bool} : Store to put the large output data to 
+                (optional, defaults to JupyterNotebook.blob_store). If False or 
+                no store, the data is written to the file.
+            json_backend {str} : JSON library to serialize the notebook with
+                (optional, defaults to JupyterNotebook.json_backend)
+        """
+        content = self._to_json(blob_store=blob_store, json_backend=json_backend, **kwargs)
+        files.write_file(file, content)
+        if hasattr(self, "file") and os.path.abspath(file) == os.path.abspath(self.file):
+            self._saved_hash = files.content_hash(content)
 
 #   Generic IO
     def to_file(self, file, *, exporter):
         "Put the notebook to a file using given exporter"
-        (body, resources) = exporter.from_notebook_node(self.node)
+        (body, resources) = exporter.from_notebook_node(self._resolve_blobs())
         with open(file, mode="w") as f:
             f.write(body)
 
@@ -196,7 +490,7 @@ class JupyterNotebook(JupyterObject):
     def _repr_html_(self):
         "Render the notebook as HTML"
         exporter = self.html_exporter
-        (body, resources) = exporter.from_notebook_node(self.node)
+        (body, resources) = exporter.from_notebook_node(self._resolve_blobs())
         return body
 
     def __str__(self):
@@ -219,8 +513,21 @@ class JupyterNotebook(JupyterObject):
     def node(self, val):
         """Set nbformat.notebooknode.NotebookNode 
         representation of the notebook"""
-        nbformat.validate(val)
+        self._set_node(val)
+
+    def _set_node(self, val, dirty=True):
+        if self.validation not in ("eager", "deferred", "off"):
+            raise ValueError(f"Invalid validation: {self.validation!r}")
         self._node = val
+        self._dirty = dirty
+        self._lazy_loaded = False
+        if self.validation == "eager":
+            self._validate_changed()
+
+    def _validate_changed(self):
+        "Validate the node if changed after the previous validation"
+        if self._dirty:
+            self.validate()
 
     @property
     def metadata(self):
@@ -233,13 +540,18 @@ class JupyterNotebook(JupyterObject):
         """Set the metadata of 
         nbformat.notebooknode.NotebookNode"""
         self.node["metadata"] = value
+        self._dirty = True
 
 # Class methods
     @classmethod
-    def from_string(cls, string):
-        "Construct notebook from string"
-        node = nbformat.reads(string, as_version=cls.nb_version)
-        return cls(node)
+    def from_string(cls, string, interner=None, json_backend=None):
+        """Construct notebook from string. Strings of the notebook are
+        deduplicated with the interner (optional, defaults to 
+        JupyterNotebook.interner) and parsed with the JSON library 
+        json_backend (optional, defaults to JupyterNotebook.json_backend)"""
+        json_backend = cls.json_backend if json_backend is None else json_backend
+        node = jsonlib.reads(string, as_version=cls.nb_version, backend=json_backend)
+        return cls(cls._intern(node, interner=interner))
 
     @classmethod
     def from_cells(cls, cells):
@@ -258,44 +570,54 @@ class JupyterNotebook(JupyterObject):
     def clear_outputs(self, inplace=None, **kwargs):
         "Clear all outputs in the notebook"
         processor = preprocessors.ClearOutputPreprocessor(**kwargs)
-        return self.process_node(processor, inplace=inplace, **kwargs)
+        return self._process_node(processor, inplace=inplace, copier=utils.copy_node)
 
     def clear_metadata(self, inplace=None, **kwargs):
         "Clear all metadata in the notebook"
         processor = preprocessors.ClearMetadataPreprocessor(**kwargs)
-        return self.process_node(processor, inplace=inplace, **kwargs)
+        return self._process_node(processor, inplace=inplace, copier=utils.copy_node)
 
     def clear_tags(self, inplace=None, **kwargs):
         "Clear all tags in the notebook"
         processor = preprocessors.TagRemovePreprocessor(**kwargs)
-        return self.process_node(processor, inplace=inplace, **kwargs)
+        return self._process_node(processor, inplace=inplace, copier=utils.copy_node)
 
     def process_node(self, preprocessor, inplace=None):
         """Process the nbformat.notebooknode.NotebookNode
         representation of the notebook with specified
         preprocessor"""
+        return self._process_node(preprocessor, inplace=inplace, copier=copy.deepcopy)
+
+    def _process_node(self, preprocessor, inplace=None, copier=copy.deepcopy):
+        """Process the node with the preprocessor. The copy-on-write
+        copier (jubox.utils.copy_node) is only for the preprocessors
+        that replace the outputs instead of modifying them in place"""
         # TODO: inplace as decorator
         if inplace is None:
             inplace = False
-        node = copy.deepcopy(self.node) if not inplace else self.node
+        node = copier(self.node) if not inplace else self.node
         preprocessor.preprocess(node, {})
         if not inplace:
             return JupyterNotebook.from_node(node)
+        self._dirty = True
 
     def append(self, cell):
         "Append cell to the notebook"
         cell = cell._node if isinstance(cell, JupyterCell) else cell
         self.node.cells.append(cell)
+        self._dirty = True
 
     def insert(self, index, cell):
         "Insert cell to the notebook"
         cell = cell._node if isinstance(cell, JupyterCell) else cell
         self.node.cells.insert(index, cell)
+        self._dirty = True
 
 # Validation
     def validate(self):
         "Validate the format of nbformat.notebooknode.NotebookNode"
         nbformat.validate(self.node)
+        self._dirty = False
 
 # Cell fetch
     def get_cells(self, **kwargs):
@@ -365,4 +687,14 @@ class JupyterNotebook(JupyterObject):
         ]
         
 def register_accessor(name):
-    return utils.register_accessor(JupyterNotebook, name)
\ No newline at end of file
+    return utils.register_accessor(JupyterNotebook, name)
+
+def _map_cell_indexes(indexes, **callbacks):
+    "Get the callbacks of a subset of the cells called with the indexes of the cells in the notebook"
+    def mapped(callback):
+        if callback is None:
+            return None
+        def wrapper(*args, cell_index, **kwargs):
+            return callback(*args, cell_index=indexes[cell_index], **kwargs)
+        return wrapper
+    return {name: mapped(callback) for name, callback in callbacks.items()}
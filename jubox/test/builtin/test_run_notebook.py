@@ -1,7 +1,10 @@
 
 from jubox import JupyterNotebook
-from jubox.builtin import run_notebook
+from jubox.builtin import run_notebook, run_notebook_async, run_notebooks
 
+import os
+import asyncio
+import pytest
 import datetime
 
 def handle_success(**kwargs):
@@ -76,3 +79,59 @@ def test_run_success_with_params(notebook_file_task, capsys):
 
     captured = capsys.readouterr()
     assert captured.out == "Notebook succeeded\nNotebook finished\n"
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_run_multiple(notebook_file_task, executor):
+    params = [dict(date=None, number=5, category=category) for category in ("a", "b", "c")]
+    notebooks = run_notebooks(
+        [notebook_file_task] * 3,
+        parameters=params,
+        max_workers=2,
+        executor=executor,
+    )
+    results = [nb.cells.get(tags=["result"])[0].outputs[0]["data"]["text/plain"] for nb in notebooks]
+    assert ["'a is the results'", "'b is the results'", "'c is the results'"] == results
+
+def test_run_multiple_error(notebook_folder, capsys):
+    notebooks = run_notebooks(
+        [os.path.join(notebook_folder, "nb_with_error.ipynb"), os.path.join(notebook_folder, "nb_task.ipynb")],
+        on_success=handle_success,
+        on_finally=handle_finally,
+        silence=True,
+        max_workers=1,
+        executor="thread",
+    )
+    captured = capsys.readouterr()
+    assert captured.out == "Notebook finished\nNotebook succeeded\nNotebook finished\n"
+    assert notebooks[0].cells.errors
+    assert not notebooks[1].cells.errors
+
+def test_run_multiple_invalid_parameters(notebook_file_task):
+    with pytest.raises(ValueError):
+        run_notebooks([notebook_file_task] * 2, parameters=[{}])
+
+def test_run_async(notebook_file_task, capsys):
+    notebook = asyncio.run(run_notebook_async(
+        notebook=notebook_file_task,
+        on_success=handle_success,
+        on_finally=handle_finally,
+        parameters=dict(date=None, number=5, category="b"),
+    ))
+
+    captured = capsys.readouterr()
+    assert captured.out == "Notebook succeeded\nNotebook finished\n"
+    assert "'b is the results'" == notebook.cells.get(tags=["result"])[0].outputs[0]["data"]["text/plain"]
+
+def test_run_async_error(notebook_file_with_error, capsys):
+    extra = {}
+    asyncio.run(run_notebook_async(
+        notebook=notebook_file_with_error,
+        on_failure=handle_failure,
+        on_finally=handle_finally,
+        silence=True,
+        extra=extra
+    ))
+
+    captured = capsys.readouterr()
+    assert captured.out == "Notebook failed\nNotebook finished\n"
+    assert extra["ename"] == "NameError"
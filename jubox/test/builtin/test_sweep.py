@@ -0,0 +1,72 @@
+import pytest
+from nbconvert.preprocessors import CellExecutionError
+
+from jubox import JupyterNotebook, CodeCell
+from jubox.builtin import sweep_notebook, parameter_grid
+
+def get_result(nb):
+    return nb.cells.get(tags=["result"])[0].outputs[0]["data"]["text/plain"]
+
+def test_grid():
+    assert [
+        {"category": "a", "number": 1}, {"category": "a", "number": 2},
+        {"category": "b", "number": 1}, {"category": "b", "number": 2},
+    ] == parameter_grid(category=["a", "b"], number=[1, 2])
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_sweep(notebook_file_task, max_workers):
+    params = [dict(date=None, number=5, category=category) for category in ("a", "b", "c")]
+    notebooks = sweep_notebook(notebook_file_task, parameters=params, max_workers=max_workers)
+
+    assert ["'a is the results'", "'b is the results'", "'c is the results'"] == [get_result(nb) for nb in notebooks]
+    for nb in notebooks:
+        assert "This is an example\n" == nb.cells[1].outputs[0]["text"]
+
+def test_sweep_grid(notebook_file_task):
+    notebooks = sweep_notebook(
+        notebook_file_task, 
+        parameters=dict(date=[None], number=[1, 2], category=["a", "b"])
+    )
+    assert 4 == len(notebooks)
+    assert "'b is the results'" == get_result(notebooks[-1])
+    assert "12\n" == notebooks[-1].cells[4].outputs[0]["text"]
+
+def test_setup_run_once():
+    nb = JupyterNotebook([
+        CodeCell("import uuid\nrun_id = uuid.uuid4().hex"),
+        CodeCell("x = None", metadata={"tags": ["parameters"]}),
+        CodeCell("run_id", metadata={"tags": ["result"]}),
+    ])
+    notebooks = sweep_notebook(nb, parameters=[dict(x=1), dict(x=2)])
+    assert get_result(notebooks[0]) == get_result(notebooks[1])
+
+def test_isolated():
+    nb = JupyterNotebook([
+        CodeCell("x = None", metadata={"tags": ["parameters"]}),
+        CodeCell("if x == 1:\n    y = 'leaked'"),
+        CodeCell("'y' in dir()", metadata={"tags": ["result"]}),
+    ])
+    notebooks = sweep_notebook(nb, parameters=[dict(x=1), dict(x=2)])
+    assert ["True", "False"] == [get_result(nb) for nb in notebooks]
+
+def test_isolated_rebound_setup():
+    nb = JupyterNotebook([
+        CodeCell("data = list(range(10))"),
+        CodeCell("cat = None", metadata={"tags": ["parameters"]}),
+        CodeCell("data = [d for d in data if d % 2 == cat]"),
+        CodeCell("len(data)", metadata={"tags": ["result"]}),
+    ])
+    notebooks = sweep_notebook(nb, parameters=[dict(cat=0), dict(cat=1)])
+    assert ["5", "5"] == [get_result(nb) for nb in notebooks]
+
+def test_error():
+    nb = JupyterNotebook([
+        CodeCell("x = None", metadata={"tags": ["parameters"]}),
+        CodeCell("1 / x", metadata={"tags": ["result"]}),
+    ])
+    with pytest.raises(CellExecutionError):
+        sweep_notebook(nb, parameters=[dict(x=0), dict(x=2)])
+
+    notebooks = sweep_notebook(nb, parameters=[dict(x=0), dict(x=2)], silence=True)
+    assert notebooks[0].cells.errors
+    assert "0.5" == get_result(notebooks[1])
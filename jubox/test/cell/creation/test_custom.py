@@ -0,0 +1,73 @@
+import pytest
+
+from jubox import CodeCell, JupyterCell, JupyterNotebook
+from jubox.cell import base
+
+from nbformat.v4 import new_code_cell, new_markdown_cell
+
+@pytest.fixture(autouse=True)
+def registries(monkeypatch):
+    # Custom classes are registered globally
+    monkeypatch.setattr(base, "CUSTOM_TAGS", {})
+    monkeypatch.setattr(base, "CUSTOM_METADATA_KEYS", {})
+    monkeypatch.setattr(base, "CUSTOM_PREDICATES", [])
+
+def test_dispatch_tag():
+    class SQLCell(CodeCell):
+        dispatch_tag = "sql"
+
+    cell = JupyterCell.from_node(new_code_cell("SELECT 1", metadata={"tags": ["sql"]}))
+    assert isinstance(cell, SQLCell)
+    assert type(JupyterCell.from_node(new_code_cell("1"))) is CodeCell
+
+    # Only for the cell type of the class
+    cell = JupyterCell.from_node(new_markdown_cell("text", metadata={"tags": ["sql"]}))
+    assert not isinstance(cell, SQLCell)
+
+def test_dispatch_metadata_key():
+    class ConfigCell(CodeCell):
+        dispatch_metadata_key = "config"
+
+    cell = JupyterCell.from_node(new_code_cell("x = 1", metadata={"config": {}}))
+    assert isinstance(cell, ConfigCell)
+    assert type(JupyterCell.from_node(new_code_cell("x = 1"))) is CodeCell
+
+def test_dispatch_predicate():
+    class ShellCell(CodeCell):
+        @classmethod
+        def accepts(cls, node):
+            return node["source"].startswith("!")
+
+    nb = JupyterNotebook([CodeCell("!ls"), CodeCell("1")])
+    assert isinstance(nb.cells[0], ShellCell)
+    assert not isinstance(nb.cells[1], ShellCell)
+
+def test_dispatch_tag_with_predicate():
+    class SQLCell(CodeCell):
+        dispatch_tag = "sql"
+
+        @classmethod
+        def accepts(cls, node):
+            return bool(node["source"])
+
+    assert isinstance(JupyterCell.from_node(new_code_cell("SELECT 1", metadata={"tags": ["sql"]})), SQLCell)
+    assert not isinstance(JupyterCell.from_node(new_code_cell("", metadata={"tags": ["sql"]})), SQLCell)
+
+def test_dispatch_not_overriding_cell_type():
+    class SQLCell(CodeCell):
+        dispatch_tag = "sql"
+
+    assert base.CELL_TYPES["code"] is CodeCell
+
+def test_dispatch_changed_tags():
+    class SQLCell(CodeCell):
+        dispatch_tag = "sql"
+
+    nb = JupyterNotebook([CodeCell("SELECT 1")])
+    assert type(nb.cells[0]) is CodeCell
+
+    nb.node.cells[0].metadata["tags"] = ["sql"]
+    assert isinstance(nb.cells[0], SQLCell)
+
+    nb.node.cells[0].metadata["tags"] = []
+    assert type(nb.cells[0]) is CodeCell
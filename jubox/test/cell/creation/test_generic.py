@@ -1,4 +1,6 @@
 
+import copy
+
 import pytest
 
 from jubox import CodeCell, MarkdownCell, RawCell, JupyterCell
@@ -38,3 +40,15 @@ def test_initiation_from_string_with_tags(cls):
     assert cell._node.source == "This is a test cell"
     assert cell._node.cell_type == cls.cell_type
     assert cell._node.metadata.tags == ["tagged"]
+
+def test_no_instance_dict():
+    for cell in (CodeCell("1"), MarkdownCell("1"), RawCell("1")):
+        assert not hasattr(cell, "__dict__")
+
+def test_accessor_cached():
+    cell = CodeCell("1")
+    assert cell.outputs is cell.outputs
+    # Copies have their own accessors
+    cell_copy = copy.copy(cell)
+    assert cell_copy.outputs is not cell.outputs
+    assert cell_copy.outputs._cell is cell_copy
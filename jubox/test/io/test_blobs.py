@@ -0,0 +1,89 @@
+import json
+
+import pytest
+
+import nbformat
+from nbformat.v4 import new_output
+
+from jubox import JupyterNotebook, CodeCell, BlobStore
+
+def read_json(file):
+    with open(file) as f:
+        return json.load(f)
+
+def test_offload(tmpdir, notebook_file_with_outputs):
+    store = BlobStore(tmpdir.join("blobs"), threshold=1000)
+    nb = JupyterNotebook(notebook_file_with_outputs)
+    image = nb.node.cells[2]["outputs"][0]["data"]["image/png"]
+    file = str(tmpdir.join("offloaded.ipynb"))
+    nb.to_ipynb(file, blob_store=store)
+
+    data = read_json(file)
+    output = data["cells"][2]["outputs"][0]
+    assert "" == output["data"]["image/png"]
+    assert "<IPython.core.display.Image object>" == "".join(output["data"]["text/plain"])
+    key = output["metadata"]["jubox_blobs"]["image/png"]
+    assert store.get(key) == image
+    # Small outputs are kept
+    assert "'This is execution result in string'" == "".join(data["cells"][3]["outputs"][0]["data"]["text/plain"])
+
+    # The notebook in memory is unchanged
+    assert image == nb.node.cells[2]["outputs"][0]["data"]["image/png"]
+
+    # Saved notebook is valid
+    nbformat.validate(nbformat.read(file, as_version=4))
+
+def test_load_lazy(tmpdir, notebook_file_with_outputs):
+    store = BlobStore(tmpdir.join("blobs"), threshold=1000)
+    image = JupyterNotebook(notebook_file_with_outputs).node.cells[2]["outputs"][0]["data"]["image/png"]
+    JupyterNotebook(notebook_file_with_outputs).to_ipynb(notebook_file_with_outputs, blob_store=store)
+
+    nb = JupyterNotebook(notebook_file_with_outputs)
+    nb.load(blob_store=store)
+    # Resolved only when accessed
+    assert "" == nb.node.cells[2]["outputs"][0]["data"]["image/png"]
+    assert image == nb.cells[2].outputs[0]["data"]["image/png"]
+    assert "jubox_blobs" not in nb.node.cells[2]["outputs"][0]["metadata"]
+
+def test_save_without_store(tmpdir, notebook_file_with_outputs):
+    store = BlobStore(tmpdir.join("blobs"), threshold=1000)
+    image = JupyterNotebook(notebook_file_with_outputs).node.cells[2]["outputs"][0]["data"]["image/png"]
+    JupyterNotebook(notebook_file_with_outputs).to_ipynb(notebook_file_with_outputs, blob_store=store)
+
+    nb = JupyterNotebook(notebook_file_with_outputs)
+    nb.load(blob_store=store)
+    inlined = str(tmpdir.join("inlined.ipynb"))
+    nb.to_ipynb(inlined, blob_store=False)
+    assert image == "".join(read_json(inlined)["cells"][2]["outputs"][0]["data"]["image/png"])
+
+def test_export_resolves(tmpdir, notebook_file_with_outputs):
+    store = BlobStore(tmpdir.join("blobs"), threshold=1000)
+    image = JupyterNotebook(notebook_file_with_outputs).node.cells[2]["outputs"][0]["data"]["image/png"]
+    JupyterNotebook(notebook_file_with_outputs).to_ipynb(notebook_file_with_outputs, blob_store=store)
+
+    nb = JupyterNotebook(notebook_file_with_outputs)
+    nb.load(blob_store=store)
+    assert image in nb._repr_html_()
+
+def test_same_content_stored_once(tmpdir):
+    store = BlobStore(tmpdir.join("blobs"), threshold=100)
+    first = store.put("B" * 200)
+    second = store.put("B" * 200)
+    assert first == second
+    assert first in store
+    assert 1 == len(tmpdir.join("blobs").listdir())
+
+@pytest.mark.parametrize("key", ["{secret}", "../secret.txt", "A" * 64])
+def test_invalid_key(tmpdir, key):
+    secret = tmpdir.join("secret.txt")
+    secret.write("secret")
+    store = BlobStore(tmpdir.join("blobs"), threshold=100)
+    key = key.format(secret=str(secret))
+
+    output = new_output("display_data", data={"text/plain": ""}, metadata={"jubox_blobs": {"text/plain": key}})
+    nb = JupyterNotebook([CodeCell("'foo'", outputs=[output])])
+    assert key not in store
+    with pytest.raises(ValueError):
+        store.get(key)
+    with pytest.raises(KeyError):
+        list(nb.cells[0].outputs)
@@ -0,0 +1,101 @@
+import os
+import pickle
+
+import pytest
+
+from jubox import JupyterNotebook, CodeCell, NotebookCache
+from jubox.io import jsonlib
+
+def create_notebook(file, source="x = 1"):
+    JupyterNotebook([CodeCell(source)]).to_ipynb(file)
+
+def count_reads(monkeypatch):
+    reads = []
+    orig = jsonlib.reads
+    def spy(*args, **kwargs):
+        reads.append(args)
+        return orig(*args, **kwargs)
+    monkeypatch.setattr(jsonlib, "reads", spy)
+    return reads
+
+def test_load_from_cache(tmpdir, monkeypatch):
+    file = str(tmpdir.join("notebook.ipynb"))
+    create_notebook(file)
+    cache = NotebookCache(str(tmpdir.join("cache")))
+    reads = count_reads(monkeypatch)
+
+    nb = JupyterNotebook(file)
+    nb.load(load_cache=cache)
+    assert len(reads) == 1
+
+    validations = []
+    monkeypatch.setattr(JupyterNotebook, "validate", lambda self: validations.append(self))
+    nb_cached = JupyterNotebook(file)
+    nb_cached.load(load_cache=cache)
+    assert len(reads) == 1
+    assert validations == []
+    assert nb_cached.node == nb.node
+    assert nb_cached.node is not nb.node
+
+def test_changed_file(tmpdir, monkeypatch):
+    file = str(tmpdir.join("notebook.ipynb"))
+    create_notebook(file)
+    cache_dir = str(tmpdir.join("cache"))
+    JupyterNotebook(file).load(load_cache=cache_dir)
+
+    create_notebook(file, source="x = 22")
+    nb = JupyterNotebook(file)
+    nb.load(load_cache=cache_dir)
+    assert nb.node.cells[0]["source"] == "x = 22"
+
+def test_eviction(tmpdir):
+    cache = NotebookCache(str(tmpdir.join("cache")))
+    files = []
+    for i in range(3):
+        file = str(tmpdir.join(f"notebook_{i}.ipynb"))
+        create_notebook(file, source="x = 1\n" * 100)
+        files.append(file)
+    JupyterNotebook(files[0]).load(load_cache=cache)
+    size = sum(stat.st_size for _, stat in cache._get_entries())
+    cache.max_size = 2 * size
+
+    JupyterNotebook(files[1]).load(load_cache=cache)
+    # Mark the first as recently used
+    os.utime(cache._get_file(cache.key(files[0])), ns=(0, 2 * 10 ** 18))
+    JupyterNotebook(files[2]).load(load_cache=cache)
+
+    assert cache.get(cache.key(files[0])) is not None
+    assert cache.get(cache.key(files[1])) is None
+    assert cache.get(cache.key(files[2])) is not None
+
+    cache.clear()
+    assert cache.get(cache.key(files[0])) is None
+
+def test_evict_only_when_full(tmpdir, monkeypatch):
+    cache = NotebookCache(str(tmpdir.join("cache")))
+    evictions = []
+    monkeypatch.setattr(NotebookCache, "evict", lambda self: evictions.append(self))
+    for i in range(3):
+        file = str(tmpdir.join(f"notebook_{i}.ipynb"))
+        create_notebook(file)
+        JupyterNotebook(file).load(load_cache=cache)
+    assert evictions == []
+    assert cache._size == sum(stat.st_size for _, stat in cache._get_entries())
+
+    cache.max_size = cache._size
+    file = str(tmpdir.join("notebook_3.ipynb"))
+    create_notebook(file)
+    JupyterNotebook(file).load(load_cache=cache)
+    assert evictions == [cache]
+
+@pytest.mark.parametrize("exc", [ValueError, TypeError, IndexError])
+def test_corrupted_entry(tmpdir, monkeypatch, exc):
+    file = str(tmpdir.join("notebook.ipynb"))
+    create_notebook(file)
+    cache = NotebookCache(str(tmpdir.join("cache")))
+    JupyterNotebook(file).load(load_cache=cache)
+
+    def load(f):
+        raise exc("Corrupted")
+    monkeypatch.setattr(pickle, "load", load)
+    assert cache.get(cache.key(file)) is None
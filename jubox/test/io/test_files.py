@@ -0,0 +1,49 @@
+import gzip
+
+import pytest
+
+from jubox import JupyterNotebook, CodeCell
+from jubox.io import files
+
+def test_gzip(tmpdir):
+    file = str(tmpdir.join("notebook.ipynb.gz"))
+    JupyterNotebook([CodeCell("x = 1\n" * 100)]).to_ipynb(file)
+    with open(file, "rb") as f:
+        assert f.read(2) == b"\x1f\x8b"
+
+    nb = JupyterNotebook(file)
+    assert nb.node.cells[0]["source"] == "x = 1\n" * 100
+
+def test_detect_by_magic_bytes(notebook_file_simple):
+    file = notebook_file_simple
+    with open(file, "rb") as f:
+        content = f.read()
+    with gzip.open(file, "wb") as f:
+        f.write(content)
+
+    with JupyterNotebook(file) as nb:
+        nb.node.cells[0]["source"] = "x = 2"
+    # Compression is kept
+    assert files.detect_compression(file) == "gzip"
+    assert JupyterNotebook(file).node.cells[0]["source"] == "x = 2"
+
+def test_zstd(tmpdir):
+    pytest.importorskip("zstandard")
+    file = str(tmpdir.join("notebook.ipynb.zst"))
+    JupyterNotebook([CodeCell("x = 1\n" * 100)]).to_ipynb(file)
+    assert files.detect_compression(file) == "zstd"
+    assert JupyterNotebook(file).node.cells[0]["source"] == "x = 1\n" * 100
+
+def test_zstd_not_installed(tmpdir, monkeypatch):
+    monkeypatch.setattr(files, "zstandard", None)
+    with pytest.raises(ImportError):
+        JupyterNotebook([CodeCell("x = 1")]).to_ipynb(str(tmpdir.join("notebook.ipynb.zst")))
+    assert tmpdir.listdir() == []
+
+def test_read_write_chunks(tmpdir, monkeypatch):
+    monkeypatch.setattr(files, "_CHUNK_SIZE", 7)
+    file = str(tmpdir.join("file.gz"))
+    content = "äö" * 100
+    files.write_file(file, content)
+    assert files.read_file(file) == content.encode("utf-8")
+    assert files.content_hash(content) == files.content_hash(content.encode("utf-8"))
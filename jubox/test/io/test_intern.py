@@ -0,0 +1,32 @@
+from jubox import JupyterNotebook, Interner
+
+def test_from_string(notebook_file_with_outputs):
+    with open(notebook_file_with_outputs) as f:
+        string = f.read()
+
+    interner = Interner()
+    first = JupyterNotebook.from_string(string, interner=interner)
+    second = JupyterNotebook.from_string(string, interner=interner)
+
+    first_cell, second_cell = first.node.cells[2], second.node.cells[2]
+    assert first_cell["source"] is second_cell["source"]
+    assert first_cell["outputs"][0]["data"]["image/png"] is second_cell["outputs"][0]["data"]["image/png"]
+    # Short strings are not interned
+    assert first.node.cells[0]["outputs"][0]["text"] not in interner._strings
+    assert all(len(value) >= interner.min_length for value in interner._strings)
+
+def test_load(notebook_file_with_outputs):
+    interner = Interner()
+    first = JupyterNotebook(notebook_file_with_outputs)
+    first.load(interner=interner)
+    second = JupyterNotebook(notebook_file_with_outputs)
+    second.load(interner=interner)
+    assert first.node.cells[2]["source"] is second.node.cells[2]["source"]
+
+    interner.clear()
+    assert 0 == len(interner)
+
+def test_default_interner(monkeypatch, notebook_file_with_outputs):
+    monkeypatch.setattr(JupyterNotebook, "interner", Interner())
+    first, second = JupyterNotebook(notebook_file_with_outputs), JupyterNotebook(notebook_file_with_outputs)
+    assert first.node.cells[2]["source"] is second.node.cells[2]["source"]
@@ -0,0 +1,55 @@
+import json
+
+import pytest
+import nbformat
+
+from jubox import JupyterNotebook
+from jubox.io import jsonlib, register_backend
+
+@pytest.mark.parametrize("backend", ["json", "auto", "orjson"])
+def test_roundtrip(tmpdir, notebook_file_with_outputs, backend):
+    pytest.importorskip("orjson")
+    file = str(tmpdir.join("roundtrip.ipynb"))
+    nb = JupyterNotebook(notebook_file_with_outputs)
+    # Non-ASCII
+    nb.node.cells[0].outputs[0]["text"] = "ä\nö\n"
+    nb.to_ipynb(file, json_backend=backend)
+
+    # Same content as written by nbformat
+    with open(file, encoding="utf-8") as f:
+        assert json.load(f) == json.loads(nbformat.writes(nb.node))
+
+    nb_read = JupyterNotebook(file)
+    nb_read.load(json_backend=backend)
+    assert nb_read.node == nbformat.read(file, as_version=4)
+
+    with open(file, encoding="utf-8") as f:
+        string = f.read()
+    assert JupyterNotebook.from_string(string, json_backend=backend).node == nb_read.node
+
+def test_global_backend(notebook_file_with_outputs, monkeypatch):
+    calls = []
+    backend = register_backend("counting", lambda s: calls.append("loads") or json.loads(s), lambda obj: calls.append("dumps") or json.dumps(obj))
+    monkeypatch.setattr(JupyterNotebook, "json_backend", "counting")
+    try:
+        JupyterNotebook(notebook_file_with_outputs).to_ipynb(notebook_file_with_outputs)
+        JupyterNotebook(notebook_file_with_outputs).load()
+    finally:
+        del jsonlib.BACKENDS["counting"]
+    assert calls == ["loads", "dumps", "loads"]
+    assert backend.name == "counting"
+
+def test_fallback(monkeypatch):
+    monkeypatch.delitem(jsonlib.BACKENDS, "orjson", raising=False)
+    with pytest.warns(UserWarning):
+        assert jsonlib.get_backend("orjson").name == "json"
+    assert jsonlib.get_backend("auto").name == "json"
+    with pytest.raises(ValueError):
+        jsonlib.get_backend("not_a_backend")
+
+def test_to_disk_format_does_not_modify(notebook_file_with_outputs):
+    nb = JupyterNotebook(notebook_file_with_outputs)
+    expected = nbformat.writes(nb.node)
+    jsonlib.to_disk_format(nb.node)
+    assert nbformat.writes(nb.node) == expected
+    assert nb.node.cells[0].outputs[0]["text"] == "This output is text\n"
@@ -0,0 +1,89 @@
+import json
+
+import pytest
+import nbformat
+from nbformat.v4 import new_output
+
+from jubox import JupyterNotebook, CodeCell, Interner
+from jubox.io import lazy
+
+def test_loads(notebook_file_with_outputs):
+    with open(notebook_file_with_outputs) as f:
+        string = f.read()
+    node = lazy.loads(string)
+    cell = node.cells[5]
+    assert not cell.outputs_loaded
+    assert cell["source"].startswith("# Multi output")
+    assert "outputs" in cell
+    assert not cell.outputs_loaded
+
+    assert node == nbformat.reads(string, as_version=4)
+    assert cell.outputs_loaded
+    assert cell.outputs[0]["text"] == "This output is text\n"
+    assert cell.outputs[3]["data"]["text/plain"] == "<IPython.core.display.HTML object>"
+
+def test_load(notebook_file_with_outputs):
+    nb = JupyterNotebook(notebook_file_with_outputs)
+    nb.load(lazy=True)
+    assert [cell.source for cell in nb.cells.get(source_match="# Output as text")] == [nb.node.cells[0]["source"]]
+    assert not nb.node.cells[0].outputs_loaded
+
+    assert nb.cells[0].outputs[0]["text"] == "This output is text\n"
+    assert nb.node.cells[0].outputs_loaded
+
+def test_copy_shares_outputs(notebook_file_with_outputs):
+    nb = JupyterNotebook(notebook_file_with_outputs)
+    nb.load(lazy=True)
+    nb_copy = nb.clear_outputs(inplace=False)
+    assert not nb.node.cells[0].outputs_loaded
+    assert nb_copy.node.cells[0]["outputs"] == []
+    assert nb.node.cells[0]["outputs"][0]["text"] == "This output is text\n"
+
+def test_save(notebook_file_with_outputs):
+    nb = JupyterNotebook(notebook_file_with_outputs)
+    nb.load(lazy=True)
+    nb.cells[3].source = "'changed'"
+    nb.save()
+    assert nbformat.read(notebook_file_with_outputs, as_version=4) == JupyterNotebook(notebook_file_with_outputs).node
+    assert JupyterNotebook(notebook_file_with_outputs).node.cells[0].outputs[0]["text"] == "This output is text\n"
+
+def test_interner(notebook_file_with_outputs):
+    with open(notebook_file_with_outputs) as f:
+        string = f.read()
+    interner = Interner(min_length=10)
+    first = lazy.loads(string, interner=interner)
+    second = lazy.loads(string, interner=interner)
+    assert first.cells[2]["source"] is second.cells[2]["source"]
+    assert first.cells[2].outputs[0]["data"]["image/png"] is second.cells[2].outputs[0]["data"]["image/png"]
+
+def test_outputs_not_decoded(notebook_file_with_outputs, monkeypatch):
+    with open(notebook_file_with_outputs) as f:
+        string = f.read()
+    decoded = []
+    class Decoder:
+        def raw_decode(self, text, idx):
+            value, end = json.JSONDecoder().raw_decode(text, idx)
+            decoded.append(value)
+            return value, end
+    monkeypatch.setattr(lazy, "_decoder", Decoder())
+    lazy.loads(string)
+    assert decoded
+    assert not any("output_type" in json.dumps(value) for value in decoded)
+
+@pytest.mark.parametrize("text", [
+    "brackets ] [ { } in text",
+    'quotes \\" and \\\\" and backslash \\',
+    "long " * 100 + "]",
+    "long with escapes\n" * 100 + "\\",
+])
+def test_skip_outputs(text):
+    string = nbformat.writes(JupyterNotebook([
+        CodeCell("print(x)", outputs=[
+            new_output("stream", name="stdout", text=text),
+            new_output("display_data", data={"text/plain": text, "image/png": "A" * 1000}, metadata={"text": [text]}),
+        ]),
+        CodeCell("x", outputs=[]),
+    ]).node)
+    node = lazy.loads(string)
+    assert node == nbformat.reads(string, as_version=4)
+    assert node.cells[0].outputs[0]["text"] == text
@@ -0,0 +1,57 @@
+from jubox import JupyterNotebook, CodeCell, CellCache
+
+def get_notebook():
+    return JupyterNotebook([
+        CodeCell("import uuid\nrun_id = uuid.uuid4().hex"),
+        CodeCell("x = 'foo'"),
+        CodeCell("run_id"),
+        CodeCell("x + 'bar'"),
+    ])
+
+def get_output(cell):
+    return cell["outputs"][0]["data"]["text/plain"]
+
+def test_restore(tmpdir):
+    cache = CellCache(str(tmpdir))
+    nb_first = get_notebook()
+    nb_first(inplace=True, cache=cache)
+
+    nb_second = get_notebook()
+    nb_second(inplace=True, cache=cache)
+
+    # Different run_id if not cached
+    assert get_output(nb_first.node.cells[2]) == get_output(nb_second.node.cells[2])
+    assert "'foobar'" == get_output(nb_second.node.cells[3])
+
+def test_changed_tail(tmpdir):
+    nb_first = get_notebook()
+    nb_first(inplace=True, cache=str(tmpdir))
+
+    nb_second = get_notebook()
+    nb_second[-1] = CodeCell("x + 'baz'")
+    nb_second(inplace=True, cache=str(tmpdir))
+
+    assert get_output(nb_first.node.cells[2]) == get_output(nb_second.node.cells[2])
+    # The kernel state is replayed for the changed cell
+    assert "'foobaz'" == get_output(nb_second.node.cells[3])
+
+def test_changed_head(tmpdir):
+    nb_first = get_notebook()
+    nb_first(inplace=True, cache=str(tmpdir))
+
+    nb_second = get_notebook()
+    nb_second[1] = CodeCell("x = 'foo' ")
+    nb_second(inplace=True, cache=str(tmpdir))
+
+    # Cells after the changed cell are executed
+    assert get_output(nb_first.node.cells[2]) != get_output(nb_second.node.cells[2])
+    assert "'foobar'" == get_output(nb_second.node.cells[3])
+
+def test_hashes_chained(tmpdir):
+    cache = CellCache(str(tmpdir))
+    cells = get_notebook().node.cells
+    hashes = cache.hashes(cells)
+
+    cells[0]["source"] = "changed"
+    changed_hashes = cache.hashes(cells)
+    assert all(hashes[i] != changed_hashes[i] for i in hashes)
@@ -0,0 +1,64 @@
+import time
+import threading
+
+import pytest
+
+from jubox import JupyterNotebook, CodeCell, KernelPool, BudgetExceededError
+from jubox.builtin import run_notebook
+
+@pytest.fixture
+def kernel_pool():
+    with KernelPool(size=1, kernel_names=["python3"]) as pool:
+        yield pool
+
+def test_execute_with_pool(notebook_file_unrun, kernel_pool):
+    nb = JupyterNotebook(notebook_file_unrun)
+    nb(inplace=True, kernel_pool=kernel_pool)
+
+    assert nb.node.cells[-1].outputs[0]["data"]["text/plain"] == "'foobar'"
+    assert {"size": 1, "idle": 1, "hits": 1, "misses": 0} == kernel_pool.stats
+
+def test_kernel_is_reset(kernel_pool):
+    JupyterNotebook([CodeCell("pool_var = 'foo'")])(inplace=True, kernel_pool=kernel_pool)
+
+    nb = JupyterNotebook([CodeCell("'pool_var' in dir()")])
+    nb(inplace=True, kernel_pool=kernel_pool)
+    assert nb.node.cells[0].outputs[0]["data"]["text/plain"] == "False"
+    assert 2 == kernel_pool.hits
+
+def test_miss(kernel_pool):
+    with kernel_pool.kernel("python3"):
+        with kernel_pool.kernel("python3"):
+            pass
+    # Pool is full when the first is returned
+    assert {"size": 1, "idle": 1, "hits": 1, "misses": 1} == kernel_pool.stats
+
+def test_run_notebook_with_pool(notebook_file_task, kernel_pool):
+    run_notebook(notebook=notebook_file_task, kernel_pool=kernel_pool)
+    assert 1 == kernel_pool.hits
+
+def test_budget_with_pool(kernel_pool):
+    nb = JupyterNotebook([CodeCell("import time\ntime.sleep(30)")])
+    start = time.monotonic()
+    with pytest.raises(BudgetExceededError):
+        nb(inplace=True, budget=2, kernel_pool=kernel_pool)
+    assert time.monotonic() - start < 15
+
+    # The interrupted kernel is returned to the pool
+    nb = JupyterNotebook([CodeCell("'foo'")])
+    nb(inplace=True, kernel_pool=kernel_pool)
+    assert nb.node.cells[0].outputs[0]["data"]["text/plain"] == "'foo'"
+    assert 2 == kernel_pool.hits
+
+def test_concurrent_release():
+    with KernelPool(size=1) as pool:
+        kernels = [pool.acquire("python3") for _ in range(2)]
+        threads = [threading.Thread(target=pool.release, args=(km, "python3")) for km in kernels]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Both were reset while the pool was empty
+        assert 1 == pool.idle("python3")
+        assert 1 == sum(km.is_alive() for km in kernels)
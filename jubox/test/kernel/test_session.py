@@ -0,0 +1,59 @@
+from nbconvert.preprocessors import CellExecutionError
+
+import pytest
+
+from jubox import JupyterNotebook, CodeCell, MarkdownCell, KernelSession, KernelPool
+
+def test_state_kept():
+    cell = CodeCell("x + 'bar'")
+    with KernelSession() as session:
+        session.run(CodeCell("x = 'foo'"))
+        session.run(cell)
+
+    assert "'foobar'" == cell.outputs[0]["data"]["text/plain"]
+    assert 2 == cell["execution_count"]
+    assert not session.is_running
+
+def test_notebook_cells(notebook_file_unrun):
+    nb = JupyterNotebook(notebook_file_unrun)
+    with KernelSession() as session:
+        for cell in nb:
+            session.run(cell)
+
+    assert nb.node.cells[-1].outputs[0]["data"]["text/plain"] == "'foobar'"
+    assert 4 == len(session.notebook)
+
+def test_string_and_markdown():
+    with KernelSession() as session:
+        cell = session.run("1 + 1")
+        md_cell = session.run(MarkdownCell("# Title"))
+    assert "2" == cell.outputs[0]["data"]["text/plain"]
+    assert "# Title" == md_cell.source
+
+def test_error():
+    with KernelSession() as session:
+        cell = CodeCell("undefined_var")
+        with pytest.raises(CellExecutionError):
+            session.run(cell)
+        assert "NameError" == cell.outputs[0]["ename"]
+
+        # Session is still usable
+        assert "2" == session.run("1 + 1").outputs[0]["data"]["text/plain"]
+
+def test_not_running():
+    session = KernelSession()
+    with pytest.raises(RuntimeError):
+        session.run("1 + 1")
+
+def test_pool():
+    with KernelPool(size=1, kernel_names=["python3"]) as pool:
+        with KernelSession(kernel_pool=pool) as session:
+            session.run("x = 1")
+        assert {"size": 1, "idle": 1, "hits": 1, "misses": 0} == pool.stats
+
+def test_silent():
+    with KernelSession() as session:
+        cell = session.run("x = 1\nx", silent=True)
+        assert 0 == len(cell.outputs)
+        assert 0 == len(session.notebook)
+        assert "2" == session.run("x + 1").outputs[0]["data"]["text/plain"]
@@ -113,4 +113,30 @@ def test_reversed():
 
     assert "first cell" == nb.node.cells[0]["source"]
     assert "second cell" == nb.node.cells[1]["source"]
-    assert "third cell" == nb.node.cells[2]["source"]
\ No newline at end of file
+    assert "third cell" == nb.node.cells[2]["source"]
+
+def test_cells_cached():
+    nb = JupyterNotebook([
+        RawCell("first cell"),
+        CodeCell("second cell"),
+    ])
+    assert nb.cells[0] is nb.cells[0]
+    assert nb[1] is nb.cells[1]
+    assert list(nb.cells) == [nb.cells[0], nb.cells[1]]
+
+    # Replaced cell
+    cell = nb.cells[1]
+    nb.cells[1] = RawCell("new cell")
+    assert nb.cells[1] is not cell
+    assert isinstance(nb.cells[1], RawCell)
+
+    # Changed cell type
+    nb.node.cells[0]["cell_type"] = "markdown"
+    assert isinstance(nb.cells[0], MarkdownCell)
+
+def test_cells_cache_dropped():
+    nb = JupyterNotebook([RawCell("first cell")])
+    for i in range(10):
+        nb.cells[0] = RawCell(f"cell {i}")
+        nb.cells[0]
+    assert len(nb._cell_cache[1]) <= 3
@@ -0,0 +1,62 @@
+import os
+
+from jubox import JupyterNotebook, NotebookCollection, CodeCell
+from nbformat.v4 import new_output
+
+def create_notebooks(directory):
+    for i in range(5):
+        JupyterNotebook([
+            CodeCell(f"x = {i}", tags=["parameters"] if i % 2 else []),
+            CodeCell("print(x)", outputs=[new_output("stream", name="stdout", text=f"{i}\n")]),
+        ]).to_ipynb(os.path.join(directory, f"nb_{i}.ipynb"))
+    with open(os.path.join(directory, "broken.ipynb"), "w") as f:
+        f.write("{not json")
+
+def test_load_directory(tmpdir):
+    create_notebooks(str(tmpdir))
+    nbs = NotebookCollection(str(tmpdir))
+    assert len(nbs) == 5
+    assert list(nbs.errors) == [str(tmpdir.join("broken.ipynb"))]
+    assert nbs[0].node.cells[0]["source"] == "x = 0"
+    assert nbs[str(tmpdir.join("nb_1.ipynb"))].node.cells[0]["source"] == "x = 1"
+
+def test_cells_get(tmpdir):
+    create_notebooks(str(tmpdir))
+    nbs = NotebookCollection(str(tmpdir.join("nb_*.ipynb")), lazy=True)
+    matches = nbs.cells.get(tags=["parameters"])
+    assert {os.path.basename(file): [cell.source for cell in cells] for file, cells in matches.items()} == {
+        "nb_1.ipynb": ["x = 1"],
+        "nb_3.ipynb": ["x = 3"],
+    }
+    assert len(nbs.cells) == 10
+
+def test_clear_outputs_save(tmpdir):
+    create_notebooks(str(tmpdir))
+    nbs = NotebookCollection(str(tmpdir.join("nb_*.ipynb")))
+    nbs.clear_outputs()
+    nbs.save()
+    assert nbs.errors == {}
+    for file in nbs.notebooks:
+        assert JupyterNotebook(file).node.cells[1]["outputs"] == []
+
+def test_to_html(tmpdir):
+    create_notebooks(str(tmpdir))
+    nbs = NotebookCollection(str(tmpdir.join("nb_*.ipynb")))
+    html_files = nbs.to_html(str(tmpdir.join("html")))
+    assert sorted(os.listdir(tmpdir.join("html"))) == [f"nb_{i}.html" for i in range(5)]
+    assert set(html_files) == set(nbs.notebooks)
+
+def test_to_html_exporter_per_notebook(tmpdir, monkeypatch):
+    create_notebooks(str(tmpdir))
+    nbs = NotebookCollection(str(tmpdir.join("nb_*.ipynb")))
+    exporters = []
+    monkeypatch.setattr(JupyterNotebook, "to_file", lambda self, file, *, exporter: exporters.append(exporter))
+    nbs.to_html(str(tmpdir.join("html")))
+    assert 5 == len({id(exporter) for exporter in exporters})
+    assert all(exporter is not JupyterNotebook.html_exporter for exporter in exporters)
+
+def test_errors_of_operation(tmpdir):
+    create_notebooks(str(tmpdir))
+    nbs = NotebookCollection([JupyterNotebook([CodeCell("x = 1")]), str(tmpdir.join("nb_0.ipynb"))])
+    nbs.save(force=True)
+    assert list(nbs.errors) == ["<notebook 0>"]
@@ -0,0 +1,63 @@
+from nbconvert.preprocessors import Preprocessor
+
+from jubox import JupyterNotebook, CodeCell
+
+def get_code_index(nb):
+    return next(i for i, cell in enumerate(nb.node.cells) if cell["cell_type"] == "code" and cell["outputs"])
+
+def test_clear_outputs_copy(notebook_file_with_outputs):
+    nb = JupyterNotebook(notebook_file_with_outputs)
+    i = get_code_index(nb)
+    n_outputs = len(nb.node.cells[i]["outputs"])
+
+    nb_cleared = nb.clear_outputs()
+    assert [] == nb_cleared.node.cells[i]["outputs"]
+    assert n_outputs == len(nb.node.cells[i]["outputs"])
+
+def test_outputs_shared(notebook_file_with_outputs):
+    nb = JupyterNotebook(notebook_file_with_outputs)
+    i = get_code_index(nb)
+
+    nb_copy = nb.clear_tags()
+    assert nb_copy.node.cells[i]["outputs"] is nb.node.cells[i]["outputs"]
+    assert nb_copy.node.cells[i] is not nb.node.cells[i]
+
+def test_copy_on_write(notebook_file_with_outputs):
+    nb = JupyterNotebook(notebook_file_with_outputs)
+    i = get_code_index(nb)
+    n_outputs = len(nb.node.cells[i]["outputs"])
+    source = nb.node.cells[i]["source"]
+
+    nb_copy = nb.clear_tags()
+    cell = nb_copy.cells[i]
+    del cell.outputs[0]
+    cell["source"] = "changed"
+    cell.metadata["tags"] = ["changed"]
+    nb_copy.metadata["changed"] = True
+
+    assert n_outputs - 1 == len(nb_copy.node.cells[i]["outputs"])
+    assert n_outputs == len(nb.node.cells[i]["outputs"])
+    assert source == nb.node.cells[i]["source"]
+    assert "changed" not in nb.node.cells[i]["metadata"].get("tags", [])
+    assert "changed" not in nb.metadata
+
+def test_process_node_copy(notebook_file_with_outputs):
+    class ModifyingPreprocessor(Preprocessor):
+        def preprocess_cell(self, cell, resources, index):
+            # Modifies the outputs in place
+            cell.get("outputs", []).clear()
+            return cell, resources
+
+    nb = JupyterNotebook(notebook_file_with_outputs)
+    i = get_code_index(nb)
+    n_outputs = len(nb.node.cells[i]["outputs"])
+    nb_processed = nb.process_node(ModifyingPreprocessor())
+    assert [] == nb_processed.node.cells[i]["outputs"]
+    assert n_outputs == len(nb.node.cells[i]["outputs"])
+
+def test_execute_copy():
+    nb = JupyterNotebook([CodeCell("'foo'")])
+    nb_run = nb()
+    assert 1 == len(nb_run.node.cells[0]["outputs"])
+    assert [] == nb.node.cells[0]["outputs"]
+    assert "timing" not in nb.node.cells[0]["metadata"]
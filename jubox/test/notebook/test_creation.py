@@ -62,4 +62,15 @@ def test_creation_another_notebook():
     assert len(nb.node.cells) == 3
     assert isinstance(nb.node.cells[0], NotebookNode)
 
-    assert nb.node is nb_orig.node
\ No newline at end of file
+    assert nb.node is nb_orig.node
+
+def test_creation_from_nodes():
+    cells = [CodeCell(f"x = {i}")._node for i in range(1000)]
+    nb = JupyterNotebook.from_cells(cells)
+    assert 1000 == len(nb)
+    assert nb.node.cells[-1] is cells[-1]
+
+def test_creation_from_notebook_node_as_cell():
+    node = JupyterNotebook([CodeCell("1")]).node
+    with pytest.raises(TypeError):
+        JupyterNotebook.from_cells([node])
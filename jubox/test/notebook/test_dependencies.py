@@ -0,0 +1,123 @@
+import pytest
+
+from jubox import JupyterNotebook, CodeCell, MarkdownCell
+from jubox.utils.dependency import get_names
+
+def get_notebook():
+    return JupyterNotebook([
+        CodeCell("import uuid\nrun_id = uuid.uuid4().hex"),
+        MarkdownCell("# Data"),
+        CodeCell("x = 'foo'"),
+        CodeCell("y = x + 'bar'"),
+        CodeCell("z = 'baz'"),
+        CodeCell("y + z"),
+        CodeCell("run_id"),
+    ])
+
+def get_output(cell):
+    return cell["outputs"][0]["data"]["text/plain"]
+
+@pytest.mark.parametrize("source,defined,used", [
+    ("x = y + 1", {"x"}, {"y"}),
+    ("import os.path\nfrom json import loads as ld", {"os", "ld"}, set()),
+    ("def f(a):\n    b = a + c\n    return b", {"f"}, {"a", "b", "c"}),
+    ("class A(Base):\n    attr = 1", {"A"}, {"Base"}),
+    ("x += 1", {"x"}, {"x"}),
+    ("df['col'] = 1", {"df"}, {"df"}),
+    ("for i in items:\n    total = i", {"i", "total"}, {"i", "items"}),
+    ("lst.append(1)", {"lst"}, {"lst"}),
+    ("sq = [i ** 2 for i in range(3)]", {"sq"}, {"i", "range"}),
+    ("{k: v for k, v in items}", set(), {"k", "v", "items"}),
+    ("[y := i for i in items]", {"y"}, {"i", "items"}),
+])
+def test_names(source, defined, used):
+    assert (defined, used) == get_names(source)
+
+@pytest.mark.parametrize("source", [
+    "x = = 1",
+    "%run setup.py",
+    "%matplotlib inline\nx = 1",
+    "!pip install numpy",
+    "from math import *",
+])
+def test_unknown_names(source):
+    assert get_names(source) is None
+
+def test_graph():
+    nb = get_notebook()
+    assert {0: set(), 2: set(), 3: {2}, 4: set(), 5: {3, 4}, 6: {0}} == nb.cells.dependencies
+    assert [2, 3, 5] == nb.cells.get_downstream(2)
+    assert [2, 3, 4, 5] == nb.cells.get_upstream([5])
+
+def test_graph_redefined():
+    nb = JupyterNotebook([
+        CodeCell("x = 1"),
+        CodeCell("x = 2"),
+        CodeCell("x"),
+    ])
+    assert {0: set(), 1: set(), 2: {1}} == nb.cells.dependencies
+
+def test_graph_comprehension():
+    nb = JupyterNotebook([
+        CodeCell("i = 10"),
+        CodeCell("sq = [0 for i in range(3)]"),
+        CodeCell("print(i)"),
+    ])
+    assert {0: set(), 1: set(), 2: {0}} == nb.cells.dependencies
+    assert [0, 2] == nb.cells.get_upstream(2)
+
+def test_graph_method_call():
+    nb = JupyterNotebook([
+        CodeCell("lst = []"),
+        CodeCell("lst.append(1)"),
+        CodeCell("print(lst)"),
+    ])
+    assert {0: set(), 1: {0}, 2: {1}} == nb.cells.dependencies
+    assert [1, 2] == nb.cells.get_downstream(1)
+
+def test_graph_unparsable():
+    nb = JupyterNotebook([
+        CodeCell("x = 1"),
+        CodeCell("x = = 2"),
+        CodeCell("y = 1"),
+    ])
+    assert {0: set(), 1: {0}, 2: {1}} == nb.cells.dependencies
+
+def test_graph_star_import():
+    nb = JupyterNotebook([
+        CodeCell("from math import *"),
+        CodeCell("x = 1"),
+        CodeCell("sqrt(x)"),
+    ])
+    assert {0: set(), 1: {0}, 2: {0, 1}} == nb.cells.dependencies
+    nb(inplace=True, changed=1)
+    assert "1.0" == get_output(nb.cells[2])
+
+def test_graph_magic():
+    nb = JupyterNotebook([
+        CodeCell("%run setup.py"),
+        CodeCell("x = 1"),
+        CodeCell("setup(x)"),
+    ])
+    assert [0, 1, 2] == nb.cells.get_upstream(2)
+
+def test_execute_changed():
+    nb = get_notebook()
+    nb(inplace=True)
+    run_id = get_output(nb.node.cells[6])
+
+    nb[4] = CodeCell("z = 'qux'")
+    nb(inplace=True, changed=4)
+
+    assert "'foobarqux'" == get_output(nb.node.cells[5])
+    # Independent cells not run
+    assert run_id == get_output(nb.node.cells[6])
+
+def test_execute_changed_not_inplace():
+    nb = get_notebook()
+    nb[4] = CodeCell("z = 'qux'")
+    nb_run = nb(changed=[4])
+
+    assert "'foobarqux'" == get_output(nb_run.node.cells[5])
+    assert [] == nb_run.node.cells[6]["outputs"]
+    assert [] == nb.node.cells[5]["outputs"]
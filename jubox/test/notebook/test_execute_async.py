@@ -0,0 +1,48 @@
+import asyncio
+
+from nbconvert.preprocessors import CellExecutionError
+
+import pytest
+
+from jubox import JupyterNotebook, CodeCell
+
+def test_execute_inplace(notebook_file_unrun):
+    nb = JupyterNotebook(notebook_file_unrun)
+    asyncio.run(nb.execute_async(inplace=True))
+
+    assert nb.node.cells[-1].outputs[0]["data"]["text/plain"] == "'foobar'"
+
+def test_execute_not_inplace(notebook_file_unrun):
+    nb = JupyterNotebook(notebook_file_unrun)
+    nb_run = asyncio.run(nb.execute_async())
+
+    assert nb_run.node.cells[-1].outputs[0]["data"]["text/plain"] == "'foobar'"
+    assert [] == nb.node.cells[-1].outputs
+
+def test_execute_concurrent():
+    notebooks = [JupyterNotebook([CodeCell(f"{i} * 2")]) for i in range(3)]
+
+    async def run_all():
+        return await asyncio.gather(*(nb.execute_async() for nb in notebooks))
+    results = asyncio.run(run_all())
+
+    assert ["0", "2", "4"] == [nb.node.cells[0].outputs[0]["data"]["text/plain"] for nb in results]
+
+def test_execute_error(notebook_file_with_error):
+    nb = JupyterNotebook(notebook_file_with_error)
+    with pytest.raises(CellExecutionError):
+        asyncio.run(nb.execute_async(inplace=True))
+    assert "NameError" == nb.node.cells[1].outputs[0]["ename"]
+
+def test_execute_cancel():
+    nb = JupyterNotebook([CodeCell("import time\ntime.sleep(30)")])
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(asyncio.wait_for(nb.execute_async(inplace=True), timeout=5))
+
+def test_execute_ignore(notebook_file_task):
+    nb = JupyterNotebook(notebook_file_task)
+    nb.clear_outputs()
+    asyncio.run(nb.execute_async(inplace=True, ignore=dict(tags=["result"])))
+
+    assert len(nb.cells[1].outputs) == 1
+    assert len(nb.cells.get(tags=["result"])[-1].outputs) == 0
@@ -0,0 +1,96 @@
+import time
+import asyncio
+
+import pytest
+
+from jubox import JupyterNotebook, CodeCell, MarkdownCell, KernelSession
+from jubox.builtin import run_notebook
+
+class Recorder:
+    def __init__(self):
+        self.events = []
+
+    def on_cell_start(self, cell, cell_index, **kwargs):
+        self.events.append(("start", cell_index))
+
+    def on_output(self, output, cell, cell_index, **kwargs):
+        self.events.append(("output", cell_index, output["output_type"]))
+
+    def on_cell_end(self, cell, cell_index, **kwargs):
+        self.events.append(("end", cell_index))
+
+    @property
+    def callbacks(self):
+        return dict(on_cell_start=self.on_cell_start, on_output=self.on_output, on_cell_end=self.on_cell_end)
+
+EXPECTED = [
+    ("start", 0), ("output", 0, "stream"), ("end", 0),
+    ("start", 1), ("end", 1),
+    ("start", 2), ("end", 2),
+    ("start", 3), ("output", 3, "execute_result"), ("end", 3),
+]
+
+def test_callbacks(notebook_file_unrun):
+    recorder = Recorder()
+    JupyterNotebook(notebook_file_unrun)(inplace=True, **recorder.callbacks)
+    assert EXPECTED == recorder.events
+
+def test_callbacks_async(notebook_file_unrun):
+    recorder = Recorder()
+    asyncio.run(JupyterNotebook(notebook_file_unrun).execute_async(inplace=True, **recorder.callbacks))
+    assert EXPECTED == recorder.events
+
+def test_markdown_not_called():
+    recorder = Recorder()
+    JupyterNotebook([MarkdownCell("# Title"), CodeCell("'bar'")])(inplace=True, **recorder.callbacks)
+    assert [("start", 1), ("output", 1, "execute_result"), ("end", 1)] == recorder.events
+
+def test_callbacks_ignored_cells():
+    starts = []
+    def on_cell_start(notebook, cell, cell_index):
+        starts.append((cell_index, cell["source"], notebook.cells[cell_index]["source"]))
+
+    nb = JupyterNotebook([
+        CodeCell("'a'", tags=["skip"]),
+        CodeCell("'b'"),
+    ])
+    run_notebook(nb, ignore_cells={"tags": ["skip"]}, on_cell_start=on_cell_start)
+    assert [(1, "'b'", "'b'")] == starts
+
+    recorder = Recorder()
+    nb(inplace=True, ignore={"tags": ["skip"]}, **recorder.callbacks)
+    assert [("start", 1), ("output", 1, "execute_result"), ("end", 1)] == recorder.events
+
+def test_callbacks_session():
+    recorder = Recorder()
+    with KernelSession(**recorder.callbacks) as session:
+        session.run("print('foo')")
+    assert [("start", 0), ("output", 0, "stream"), ("end", 0)] == recorder.events
+
+def test_callbacks_error(notebook_file_with_error):
+    recorder = Recorder()
+    run_notebook(notebook_file_with_error, silence=True, **recorder.callbacks)
+    assert [
+        ("start", 0), ("output", 0, "stream"), ("end", 0),
+        ("start", 1), ("output", 1, "error"), ("end", 1),
+    ] == recorder.events
+
+def test_run_notebook_arguments(notebook_file_unrun):
+    calls = []
+    def on_output(notebook, output, cell, cell_index, extra):
+        calls.append((type(notebook).__name__, extra))
+    run_notebook(notebook_file_unrun, on_output=on_output, extra="x")
+    assert [("JupyterNotebook", "x")] * 2 == calls
+
+def test_abort():
+    def on_output(output, **kwargs):
+        if "stop" in output.get("text", ""):
+            raise RuntimeError("Bad output")
+
+    nb = JupyterNotebook([
+        CodeCell("import time\nprint('stop', flush=True)\ntime.sleep(30)\nprint('not reached')"),
+    ])
+    start = time.time()
+    with pytest.raises(RuntimeError):
+        nb(inplace=True, on_output=on_output)
+    assert time.time() - start < 20
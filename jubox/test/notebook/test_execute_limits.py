@@ -0,0 +1,66 @@
+import os
+
+from jubox import JupyterNotebook, CodeCell, OutputLimits
+
+def get_streams(cell, name="stdout"):
+    return "".join(out["text"] for out in cell.outputs if out["output_type"] == "stream" and out["name"] == name)
+
+def test_stream_limit():
+    nb = JupyterNotebook([
+        CodeCell("import sys\nfor i in range(1000):\n    print('x' * 99); sys.stdout.flush()"),
+        CodeCell("print('foo')"),
+    ])
+    nb(inplace=True, output_limits=OutputLimits(stream_bytes=1000))
+
+    assert len(get_streams(nb.cells[0])) == 1000
+    assert "Output truncated" in get_streams(nb.cells[0], "stderr")
+    # Limit is per cell
+    assert get_streams(nb.cells[1]) == "foo\n"
+
+def test_stream_limit_spill(tmpdir):
+    spill_dir = os.path.join(tmpdir, "spill")
+    nb = JupyterNotebook([
+        CodeCell("import sys\nfor i in range(100):\n    print('x' * 99); sys.stdout.flush()"),
+    ])
+    nb(inplace=True, output_limits={"stream_bytes": 500, "spill_dir": spill_dir})
+
+    files = os.listdir(spill_dir)
+    assert len(files) == 1
+    with open(os.path.join(spill_dir, files[0])) as f:
+        spilled = f.read()
+    assert get_streams(nb.cells[0]) + spilled == ("x" * 99 + "\n") * 100
+    assert files[0] in get_streams(nb.cells[0], "stderr")
+
+def test_outputs_limit():
+    nb = JupyterNotebook([
+        CodeCell("from IPython.display import display\nfor i in range(20):\n    display(i)"),
+    ])
+    nb(inplace=True, output_limits=OutputLimits(outputs=5))
+    outputs = nb.cells[0].outputs
+    assert [out["data"]["text/plain"] for out in outputs if out["output_type"] == "display_data"] == ["0", "1", "2", "3", "4"]
+    assert outputs[-1]["output_type"] == "stream"
+    assert "Output truncated" in outputs[-1]["text"]
+
+def test_notebook_limit():
+    nb = JupyterNotebook([
+        CodeCell("print('a' * 60)"),
+        CodeCell("print('b' * 60)"),
+        CodeCell("print('c' * 60)"),
+    ])
+    nb(inplace=True, output_limits=OutputLimits(notebook_stream_bytes=100))
+    assert len(get_streams(nb.cells[0])) == 61
+    assert get_streams(nb.cells[1]) == "b" * 39
+    assert get_streams(nb.cells[2]) == ""
+    assert "Output truncated" in get_streams(nb.cells[2], "stderr")
+
+def test_image_limit():
+    nb = JupyterNotebook([
+        CodeCell(
+            "from IPython.display import display\n"
+            "display({'image/png': 'a' * 1000, 'text/plain': 'image'}, raw=True)"
+        ),
+    ])
+    nb(inplace=True, output_limits=OutputLimits(image_bytes=100))
+    output = nb.cells[0].outputs[0]
+    assert output["data"] == {"text/plain": "image"}
+    assert "Output truncated" in nb.cells[0].outputs[1]["text"]
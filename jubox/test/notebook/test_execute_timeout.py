@@ -0,0 +1,88 @@
+import time
+import asyncio
+
+import pytest
+
+from jubox import JupyterNotebook, CodeCell, BudgetExceededError
+
+def test_cell_timeout_metadata():
+    nb = JupyterNotebook([
+        CodeCell("import time"),
+        CodeCell("time.sleep(10)", timeout=1),
+    ])
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        nb(inplace=True)
+    assert time.monotonic() - start < 9
+
+def test_cell_timeout_tag():
+    nb = JupyterNotebook([
+        CodeCell("import time"),
+        CodeCell("time.sleep(10)", tags=["timeout=1"]),
+    ])
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        nb(inplace=True)
+    assert time.monotonic() - start < 9
+
+def test_cell_timeout_overrides_default():
+    nb = JupyterNotebook([
+        CodeCell("import time"),
+        CodeCell("time.sleep(2)\n'done'", tags=["timeout=30"]),
+    ])
+    nb(inplace=True, timeout=1)
+    assert nb.cells[1].outputs[0]["data"]["text/plain"] == "'done'"
+
+def test_cell_timeout_tag_invalid():
+    nb = JupyterNotebook([CodeCell("'done'", tags=["timeout=abc"])])
+    with pytest.warns(UserWarning, match="timeout=abc"):
+        nb(inplace=True)
+    assert nb.cells[0].outputs[0]["data"]["text/plain"] == "'done'"
+
+def test_cell_timeout_metadata_string():
+    nb = JupyterNotebook([
+        CodeCell("import time"),
+        CodeCell("time.sleep(10)", timeout="1"),
+    ])
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        nb(inplace=True)
+    assert time.monotonic() - start < 9
+
+def test_cell_timeout_metadata_invalid():
+    nb = JupyterNotebook([CodeCell("'done'", timeout="abc")])
+    with pytest.warns(UserWarning, match="'abc'"):
+        nb(inplace=True)
+    assert nb.cells[0].outputs[0]["data"]["text/plain"] == "'done'"
+
+def get_slow_notebook():
+    return JupyterNotebook([
+        CodeCell("import sys, time\nprint('first')"),
+        CodeCell("print('second'); sys.stdout.flush()\ntime.sleep(0.5)\ntime.sleep(20)"),
+        CodeCell("print('third')"),
+    ])
+
+def test_budget():
+    nb = get_slow_notebook()
+    start = time.monotonic()
+    with pytest.raises(BudgetExceededError):
+        nb(inplace=True, budget=5, timeout=30)
+    assert time.monotonic() - start < 15
+
+    # Partial outputs are kept
+    assert nb.cells[0].outputs[0]["text"] == "first\n"
+    assert nb.cells[1].outputs[0]["text"] == "second\n"
+    assert len(nb.cells[2].outputs) == 0
+
+def test_budget_not_exceeded():
+    nb = JupyterNotebook([CodeCell("'foo'")])
+    nb(inplace=True, budget=60)
+    assert nb.cells[0].outputs[0]["data"]["text/plain"] == "'foo'"
+
+def test_budget_async():
+    nb = get_slow_notebook()
+    with pytest.raises(BudgetExceededError):
+        asyncio.run(nb.execute_async(inplace=True, budget=5))
+
+    assert nb.cells[1].outputs[0]["text"] == "second\n"
+    assert len(nb.cells[2].outputs) == 0
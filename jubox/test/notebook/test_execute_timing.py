@@ -0,0 +1,45 @@
+import datetime
+
+from jubox import JupyterNotebook, CodeCell, MarkdownCell
+from jubox.builtin import run_notebook
+
+def get_records(timings):
+    # DataFrame if pandas is installed
+    if hasattr(timings, "reset_index"):
+        return timings.reset_index().to_dict("records")
+    return timings
+
+def test_timing_metadata():
+    nb = JupyterNotebook([
+        MarkdownCell("# Title"),
+        CodeCell("import time\ntime.sleep(0.5)"),
+        CodeCell(""),
+    ])
+    nb(inplace=True)
+
+    timing = nb.cells[1].metadata["timing"]
+    assert timing["duration"] >= 0.5
+    assert timing["queue_to_idle"] >= timing["duration"] - 0.1
+    start = datetime.datetime.fromisoformat(timing["start"])
+    end = datetime.datetime.fromisoformat(timing["end"])
+    assert (end - start).total_seconds() == timing["duration"]
+
+    # Not executed
+    assert "timing" not in nb.cells[0].metadata
+    assert "timing" not in nb.cells[2].metadata
+
+def test_timings_table():
+    nb = run_notebook(JupyterNotebook([
+        MarkdownCell("# Title"),
+        CodeCell("import time\ntime.sleep(0.5)"),
+        CodeCell(""),
+        CodeCell("'foo'"),
+    ]))
+
+    records = get_records(nb.cells.timings)
+    assert [1, 3] == [record["cell_index"] for record in records]
+    assert records[0]["duration"] > records[1]["duration"]
+    assert {"cell_index", "start", "end", "duration", "queue_to_idle"} == set(records[0])
+
+def test_timings_not_run(notebook_file_unrun):
+    assert [] == get_records(JupyterNotebook(notebook_file_unrun).cells.timings)
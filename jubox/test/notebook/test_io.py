@@ -63,3 +63,48 @@ def test_to_ipynb_path(notebook_path):
         cont = file.read()
     assert "# This is simple Jupyter Notebook" in cont
     assert '"nbformat":' in cont # Check it has Notebooks' autogenerated stuff
+
+def get_writes(monkeypatch):
+    from jubox.io import files
+    writes = []
+    write_file = files.write_file
+    def spy(file, content, **kwargs):
+        writes.append(file)
+        write_file(file, content, **kwargs)
+    monkeypatch.setattr(files, "write_file", spy)
+    return writes
+
+def test_save_skip_unchanged(notebook_file_unrun, monkeypatch):
+    JupyterNotebook(notebook_file_unrun).save(force=True)
+    writes = get_writes(monkeypatch)
+
+    with JupyterNotebook(notebook_file_unrun) as nb:
+        nb.cells.get(cell_type="code")
+    assert writes == []
+
+    with JupyterNotebook(notebook_file_unrun) as nb:
+        nb.node.cells[0]["source"] = 'print("This notebook is modified")'
+    assert len(writes) == 1
+    assert 'print("This notebook is modified")' == JupyterNotebook(notebook_file_unrun).node.cells[0]["source"]
+
+    # Saving again does not write
+    nb.save()
+    assert len(writes) == 1
+
+def test_save_atomic(notebook_file_unrun, monkeypatch):
+    import os
+    with open(notebook_file_unrun) as f:
+        original = f.read()
+
+    def fail(*args):
+        raise OSError("Disk full")
+    monkeypatch.setattr(os, "replace", fail)
+
+    nb = JupyterNotebook(notebook_file_unrun)
+    nb.node.cells[0]["source"] = 'print("This notebook is modified")'
+    with pytest.raises(OSError):
+        nb.save()
+
+    with open(notebook_file_unrun) as f:
+        assert original == f.read()
+    assert os.listdir(os.path.dirname(notebook_file_unrun)) == ["notebook.ipynb"]
@@ -0,0 +1,78 @@
+import nbformat
+import pytest
+
+from jubox import JupyterNotebook, CodeCell
+
+def get_invalid_node():
+    node = nbformat.v4.new_notebook()
+    node.cells.append(nbformat.NotebookNode({"cell_type": "code"}))
+    return node
+
+@pytest.fixture
+def count_validations(monkeypatch):
+    counter = {"n": 0}
+    validate = JupyterNotebook.validate
+    def counted(self):
+        counter["n"] += 1
+        return validate(self)
+    monkeypatch.setattr(JupyterNotebook, "validate", counted)
+    return counter
+
+def test_eager():
+    with pytest.raises(nbformat.ValidationError):
+        JupyterNotebook(get_invalid_node())
+
+def test_deferred(monkeypatch, tmpdir):
+    monkeypatch.setattr(JupyterNotebook, "validation", "deferred")
+    nb = JupyterNotebook(get_invalid_node())
+    with pytest.raises(nbformat.ValidationError):
+        nb.to_ipynb(tmpdir.join("notebook.ipynb"))
+
+def test_off(monkeypatch, count_validations):
+    monkeypatch.setattr(JupyterNotebook, "validation", "off")
+    JupyterNotebook(get_invalid_node())
+    assert 0 == count_validations["n"]
+
+def test_invalid_policy(monkeypatch):
+    monkeypatch.setattr(JupyterNotebook, "validation", "sometimes")
+    with pytest.raises(ValueError):
+        JupyterNotebook()
+
+def test_validated_once(monkeypatch, tmpdir, count_validations):
+    monkeypatch.setattr(JupyterNotebook, "validation", "deferred")
+    nb = JupyterNotebook([CodeCell("1"), CodeCell("2")])
+    nb.to_ipynb(tmpdir.join("first.ipynb"))
+    nb.to_ipynb(tmpdir.join("second.ipynb"))
+    assert 1 == count_validations["n"]
+
+    # Changed
+    nb.append(CodeCell("3"))
+    nb.to_ipynb(tmpdir.join("third.ipynb"))
+    assert 2 == count_validations["n"]
+
+def test_wrapping_not_revalidated(notebook_file_simple, count_validations):
+    nb = JupyterNotebook(notebook_file_simple)
+    nb.load()
+    assert 1 == count_validations["n"]
+    JupyterNotebook(nb)
+    assert 1 == count_validations["n"]
+
+def test_deferred_cell_changed(monkeypatch, tmpdir, count_validations):
+    monkeypatch.setattr(JupyterNotebook, "validation", "deferred")
+    file = tmpdir.join("notebook.ipynb")
+    nb = JupyterNotebook([CodeCell("1")])
+    nb.to_ipynb(file)
+    assert 1 == count_validations["n"]
+
+    nb.cells[0]["execution_count"] = "invalid"
+    with pytest.raises(nbformat.ValidationError):
+        nb.to_ipynb(file)
+
+def test_lazy_validated_on_save(tmpdir):
+    file = str(tmpdir.join("notebook.ipynb"))
+    JupyterNotebook([CodeCell("1")]).to_ipynb(file)
+    nb = JupyterNotebook(file)
+    nb.load(lazy=True)
+    nb.cells[0]["execution_count"] = "invalid"
+    with pytest.raises(nbformat.ValidationError):
+        nb.save()
@@ -1,6 +1,7 @@
 from .match_node import cell_match
-from .node import to_cell_node, is_node
+from .node import to_cell_node, is_node, copy_node, copy_cell_node
 from .accessor import register_accessor
+from .dependency import dependency_graph, get_downstream, get_upstream
 from . import outputs
 
 from . import html
\ No newline at end of file
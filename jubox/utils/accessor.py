@@ -2,16 +2,28 @@
 
 class Accessor:
 
-    def __init__(self, cls):
+    def __init__(self, cls, name=None):
         self.cls = cls
-
+        self.name = name
 
     def __get__(self, instance, owner):
         # instance.self
         # where self is CLASS attribute of owner
         # and instance is instance of owner class
-
-        return self.cls(instance)
+        if instance is None or self.name is None:
+            return self.cls(instance)
+
+        # Accessor instances are cached to the
+        # instance's attribute _accessors
+        accessors = getattr(instance, "_accessors", None)
+        if accessors is None:
+            accessors = {}
+            object.__setattr__(instance, "_accessors", accessors)
+        accessor = accessors.get(self.name)
+        if accessor is None:
+            accessor = self.cls(instance)
+            accessors[self.name] = accessor
+        return accessor
 
     def __set__(self, instance, value):
         # instance.self = value
@@ -27,6 +39,6 @@ class Accessor:
 def register_accessor(cls_parent, name):
     # Inspiration: https://github.com/pandas-dev/pandas/blob/c21be0562a33d149b62735fc82aff80e4d5942f5/pandas/core/accessor.py#L197
     def wrapper(cls):
-        setattr(cls_parent, name, Accessor(cls))
+        setattr(cls_parent, name, Accessor(cls, name))
         return cls
     return wrapper
\ No newline at end of file
@@ -0,0 +1,199 @@
+"""
+Dependencies between code cells from the names
+the cells define and use (Python kernels)
+"""
+
+import ast
+
+def get_names(source):
+    """Get the names a Python source defines and uses
+    on the module level. Returns None if the names
+    cannot be known: the source cannot be parsed or
+    it has IPython magics or star imports.
+
+    Returns:
+    --------
+        Tuple[Set[str], Set[str]] : Defined names and used names
+    """
+    # IPython magics and shell commands (ie. %run) may
+    # define and use any names
+    if any(line.lstrip().startswith(("%", "!")) for line in source.splitlines()):
+        return None
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return None
+
+    visitor = _NameVisitor()
+    visitor.visit(tree)
+    if visitor.star_import:
+        return None
+    return visitor.defined, visitor.used
+
+def dependency_graph(cells):
+    """Get the dependencies of the code cells
+
+    A cell depends on the latest previous cell that
+    defines a name the cell uses. A cell whose names
+    cannot be known (see get_names) depends on all 
+    previous code cells and all the cells after it 
+    depend on it.
+
+    Arguments:
+    ----------
+        cells {List[nbformat.notebooknode.NotebookNode]} : Cells of a notebook
+
+    Returns:
+    --------
+        Dict[int, Set[int]] : Index of a code cell: indexes of the cells it depends on
+    """
+    graph = {}
+    last_defined = {}
+    last_opaque = None
+    for index, cell in enumerate(cells):
+        if cell["cell_type"] != "code":
+            continue
+        names = get_names(cell["source"])
+        if names is None:
+            graph[index] = set(graph)
+            last_opaque = index
+            continue
+
+        defined, used = names
+        deps = {last_defined[name] for name in used if name in last_defined}
+        if last_opaque is not None:
+            deps.add(last_opaque)
+        graph[index] = deps
+        for name in defined:
+            last_defined[name] = index
+    return graph
+
+def get_downstream(graph, indexes):
+    "Get the cells (indexes) that depend on given cells directly or indirectly (including themselves)"
+    downstream = set(indexes)
+    for index in sorted(graph):
+        if graph[index] & downstream:
+            downstream.add(index)
+    return downstream
+
+def get_upstream(graph, indexes):
+    "Get the cells (indexes) given cells depend on directly or indirectly (including themselves)"
+    upstream = set(indexes)
+    for index in sorted(graph, reverse=True):
+        if index in upstream:
+            upstream |= graph[index]
+    return upstream
+
+
+class _NameVisitor(ast.NodeVisitor):
+    "Collect the defined and used names of module level"
+
+    def __init__(self):
+        self.defined = set()
+        self.used = set()
+        self._depth = 0 # Depth of function/class scopes
+        self._comprehensions = 0 # Depth of comprehension scopes
+        self.star_import = False
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Load):
+            self.used.add(node.id)
+        elif self._depth == 0 and self._comprehensions == 0:
+            # Store or Del
+            self.defined.add(node.id)
+            if isinstance(node.ctx, ast.Del):
+                self.used.add(node.id)
+
+    def visit_AugAssign(self, node):
+        if isinstance(node.target, ast.Name):
+            self.used.add(node.target.id)
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node):
+        self._visit_modified(node)
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node):
+        self._visit_modified(node)
+        self.generic_visit(node)
+
+    def visit_Call(self, node):
+        # Calling a method (ie. lst.append(1)) may modify
+        # the object thus the base name is redefined
+        if isinstance(node.func, ast.Attribute):
+            base = _get_base(node.func)
+            if isinstance(base, ast.Name):
+                self._define(base.id)
+        self.generic_visit(node)
+
+    def visit_NamedExpr(self, node):
+        # Binds to the enclosing scope also in a comprehension
+        self._define(node.target.id)
+        self.visit(node.value)
+
+    def visit_ListComp(self, node):
+        # The targets are local to the comprehension
+        self._comprehensions += 1
+        self.generic_visit(node)
+        self._comprehensions -= 1
+
+    visit_SetComp = visit_ListComp
+    visit_DictComp = visit_ListComp
+    visit_GeneratorExp = visit_ListComp
+
+    def visit_Global(self, node):
+        self.defined.update(node.names)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self._define(alias.asname or alias.name.split(".")[0])
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            if alias.name == "*":
+                self.star_import = True
+            self._define(alias.asname or alias.name)
+
+    def visit_FunctionDef(self, node):
+        self._define(node.name)
+        for decorator in node.decorator_list:
+            self.visit(decorator)
+        self.visit(node.args)
+        self._visit_scope(node.body)
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        self._define(node.name)
+        for expr in node.decorator_list + node.bases:
+            self.visit(expr)
+        self._visit_scope(node.body)
+
+    def visit_Lambda(self, node):
+        self._visit_scope([node.body])
+
+    def _visit_scope(self, body):
+        self._depth += 1
+        for stmt in body:
+            self.visit(stmt)
+        self._depth -= 1
+
+    def _define(self, name):
+        if self._depth == 0:
+            self.defined.add(name)
+
+    def _visit_modified(self, node):
+        # Modifying an attribute or item (ie. df["col"] = ...)
+        # modifies the object thus the base name is redefined
+        if isinstance(node.ctx, (ast.Store, ast.Del)):
+            base = _get_base(node)
+            if isinstance(base, ast.Name):
+                self._define(base.id)
+
+
+def _get_base(node):
+    "Get the base of an attribute or item (ie. df of df.loc[0])"
+    base = node.value
+    while isinstance(base, (ast.Attribute, ast.Subscript)):
+        base = base.value
+    return base
@@ -1,6 +1,8 @@
 
 import nbformat
 
+import copy
+
 def to_cell_node(item):
     if hasattr(item, "_node"):
         return item._node
@@ -12,12 +14,31 @@ def to_cell_node(item):
         raise TypeError(f"Cannot turn to cell node: {type(item)}")
 
 def is_notebook_node(item):
-    try:
-        nbformat.validate(item)
-    except:
-        return False
-    else:
-        return True
+    "Whether the node is a notebook (instead of a cell). Does not validate the node"
+    return "cell_type" not in item and "cells" in item and "nbformat" in item
 
 def is_node(item):
     return isinstance(item, nbformat.NotebookNode)
+
+def copy_node(node):
+    """Copy-on-write copy of a notebook node
+
+    The notebook, its cells and their metadata are copied
+    but the outputs (and the sources) of the cells are shared 
+    with the original. Operations that modify the outputs of 
+    the copy must replace the outputs of the cell instead of 
+    modifying them in place (as the execution, clearing the 
+    outputs and the outputs accessor of the cells do).
+    """
+    copied = nbformat.NotebookNode(node)
+    copied["metadata"] = copy.deepcopy(node["metadata"])
+    copied["cells"] = [copy_cell_node(cell) for cell in node["cells"]]
+    return copied
+
+def copy_cell_node(cell):
+    "Copy-on-write copy of a cell node (see copy_node)"
+    # Lazily loaded cells share the unparsed outputs
+    copier = getattr(type(cell), "__copy__", None)
+    copied = copier(cell) if copier is not None else nbformat.NotebookNode(cell)
+    copied["metadata"] = copy.deepcopy(cell["metadata"])
+    return copied